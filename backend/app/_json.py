@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+"""
+JSON helpers for hot paths: orjson's C encoder/decoder when available, with a
+stdlib fallback so the app still runs without it. Output is interchangeable
+(non-ASCII passes through unescaped in both).
+"""
+
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(s: str | bytes) -> Any:
+        return orjson.loads(s)
+
+except Exception:  # noqa: BLE001
+    import json
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def loads(s: str | bytes) -> Any:
+        return json.loads(s)
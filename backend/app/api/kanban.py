@@ -108,7 +108,7 @@ async def post_approve(card_id: str, body: ApproveBody) -> dict:
             },
         )
 
-    return {"ok": True, "job": job.__dict__}
+    return {"ok": True, "job": job.to_dict()}
 
 
 @router.post("/api/kanban/pending/{card_id}/reject")
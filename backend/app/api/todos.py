@@ -26,7 +26,7 @@ class DeleteBody(BaseModel):
 def get_today() -> dict:
     day = today_str()
     tasks, notes = load_day(day)
-    return {"day": day, "tasks": [t.__dict__ for t in tasks], "notes": notes}
+    return {"day": day, "tasks": [t.to_dict() for t in tasks], "notes": notes}
 
 
 @router.post("/api/todos/today/add")
@@ -34,7 +34,7 @@ def post_add(body: AddBody) -> dict:
     day = today_str()
     try:
         tasks, notes = add_task(day, body.text)
-        return {"day": day, "tasks": [t.__dict__ for t in tasks], "notes": notes}
+        return {"day": day, "tasks": [t.to_dict() for t in tasks], "notes": notes}
     except TodoError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
@@ -44,7 +44,7 @@ def patch_set_done(body: SetDoneBody) -> dict:
     day = today_str()
     try:
         tasks, notes = set_done(day, body.id, body.done)
-        return {"day": day, "tasks": [t.__dict__ for t in tasks], "notes": notes}
+        return {"day": day, "tasks": [t.to_dict() for t in tasks], "notes": notes}
     except TodoError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
@@ -54,6 +54,6 @@ def delete_today(body: DeleteBody) -> dict:
     day = today_str()
     try:
         tasks, notes = delete_task(day, body.id)
-        return {"day": day, "tasks": [t.__dict__ for t in tasks], "notes": notes}
+        return {"day": day, "tasks": [t.to_dict() for t in tasks], "notes": notes}
     except TodoError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
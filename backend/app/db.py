@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import functools
 import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
 
 
 def db_path() -> Path:
@@ -21,6 +26,68 @@ def connect() -> sqlite3.Connection:
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
     conn.execute("PRAGMA foreign_keys=ON;")
+    # Wait for a lock instead of failing immediately with SQLITE_BUSY.
+    conn.execute("PRAGMA busy_timeout=30000;")
+    return conn
+
+
+_tls = threading.local()
+
+
+def _rollback_pooled() -> None:
+    # Best-effort: discard any statements a failed attempt left in this
+    # thread's open implicit transaction. Without this, a retry re-runs fn on
+    # top of the half-applied first attempt (duplicating its writes), and on
+    # final failure the leaked statements would ride along with whatever this
+    # thread commits next.
+    conn = getattr(_tls, "conn", None)
+    if conn is not None:
+        try:
+            conn.rollback()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+def retry_on_busy(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Retry a store function on 'database is locked/busy' with bounded
+    exponential backoff. busy_timeout covers waits within a statement; this
+    covers the rare deadlock-style failure that still surfaces under
+    concurrent writers.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        delay = 0.01
+        attempts = 5
+        for attempt in range(attempts):
+            try:
+                return fn(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                _rollback_pooled()
+                msg = str(e)
+                if "locked" not in msg and "busy" not in msg:
+                    raise
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+        raise AssertionError("unreachable")
+
+    return wrapper
+
+
+def pooled() -> sqlite3.Connection:
+    """
+    Thread-local pooled connection. Re-opening the DB per query re-reads the
+    header, re-applies PRAGMAs, and drops the statement cache; keeping one
+    connection per thread makes small lookups nearly free. Callers must NOT
+    close the returned connection (commit is still up to the caller).
+    """
+    conn: sqlite3.Connection | None = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = connect()
+        _tls.conn = conn
     return conn
 
 
@@ -45,6 +112,7 @@ def _apply_migrations(conn: sqlite3.Connection) -> None:
     migrations: list[tuple[str, str]] = [
         ("001_initial", _MIG_001_INITIAL),
         ("002_settings", _MIG_002_SETTINGS),
+        ("003_notion_indexes", _MIG_003_NOTION_INDEXES),
     ]
     applied = {row["id"] for row in conn.execute("SELECT id FROM schema_migrations")}
     for mid, sql in migrations:
@@ -153,4 +221,15 @@ CREATE TABLE IF NOT EXISTS settings (
 );
 """
 
+# Indexes backing the hot cache/sync queries:
+#   list_cards:        WHERE board_id=? ORDER BY cached_at DESC
+#   process_next_job:  WHERE status='queued' ORDER BY created_at ASC LIMIT 1
+_MIG_003_NOTION_INDEXES = r"""
+CREATE INDEX IF NOT EXISTS idx_notion_cards_board_cached
+ON notion_cards(board_id, cached_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_notion_sync_jobs_status_created
+ON notion_sync_jobs(status, created_at);
+"""
+
 
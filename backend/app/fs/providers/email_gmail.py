@@ -52,13 +52,13 @@ def _truncate_utf8(s: str, cap_bytes: int) -> str:
     b = s.encode("utf-8", errors="replace")
     if len(b) <= cap_bytes:
         return s
-    cut = b[:cap_bytes]
-    while cut:
-        try:
-            return cut.decode("utf-8", errors="strict")
-        except UnicodeDecodeError:
-            cut = cut[:-1]
-    return ""
+    # Walk the cut point back over UTF-8 continuation bytes (0b10xxxxxx) so
+    # it lands on a character boundary: at most 3 steps and no decode-retry
+    # allocations.
+    end = cap_bytes
+    while end > 0 and (b[end] & 0xC0) == 0x80:
+        end -= 1
+    return b[:end].decode("utf-8")
 
 
 def _split(path: str) -> list[str]:
@@ -27,6 +27,30 @@ class SkillsMixin:
         """
         return None
 
+    def _skills_index(
+        self, skills: Iterable[Skill]
+    ) -> tuple[dict[str, Skill], tuple[str, ...], tuple[str, ...]]:
+        """
+        Build name->Skill plus the suffix tuples used for matching.
+
+        str.endswith accepts a tuple and scans all suffixes in one C call, so we
+        precompute one tuple for skill dirs and one for SKILL.md files instead of
+        looping endswith per skill. Only the suffix tuples are cached (keyed by
+        skill names) — providers re-read skill content from disk per call, so
+        by_name must be rebuilt fresh or edits to a mounted SKILL.md would keep
+        serving the stale Skill.
+        """
+        by_name = {s.name: s for s in skills}
+        key = tuple(by_name)
+        cached = getattr(self, "_skills_index_cache", None)
+        if cached is not None and cached[0] == key:
+            dir_suffixes, file_suffixes = cached[1]
+        else:
+            dir_suffixes = tuple(f"/.ochre/skills/{name}" for name in by_name)
+            file_suffixes = tuple(f"/.ochre/skills/{name}/SKILL.md" for name in by_name)
+            self._skills_index_cache = (key, (dir_suffixes, file_suffixes))
+        return by_name, dir_suffixes, file_suffixes
+
     def _handle_skills_list(self, path: str, skills: Iterable[Skill]) -> dict[str, Any] | None:
         """
         Helper to handle fs_list calls for .ochre/skills/
@@ -35,14 +59,15 @@ class SkillsMixin:
         # We expect path to be relative to the VFS root or absolute.
         # But providers usually get the full absolute path.
         # Let's assume the provider calls this with the full path, and we check suffixes.
-        
+
         # normalize: remove trailing slash
         clean_path = path.rstrip("/")
-        
+        by_name, dir_suffixes, _file_suffixes = self._skills_index(skills)
+
         # Check if we are listing the skills root
         if clean_path.endswith("/.ochre/skills"):
             entries = []
-            for s in skills:
+            for s in by_name.values():
                 entries.append({
                     "name": s.name,
                     "path": f"{clean_path}/{s.name}",
@@ -52,21 +77,20 @@ class SkillsMixin:
             return {"path": path, "entries": entries}
 
         # Check if we are listing a specific skill directory
-        for s in skills:
-            skill_path = f"/.ochre/skills/{s.name}"
-            if clean_path.endswith(skill_path):
-                return {
-                    "path": path,
-                    "entries": [
-                        {
-                            "name": "SKILL.md",
-                            "path": f"{clean_path}/SKILL.md",
-                            "kind": "file",
-                            "size": len(s.content)
-                        }
-                    ]
-                }
-        
+        if dir_suffixes and clean_path.endswith(dir_suffixes):
+            s = by_name[clean_path[clean_path.rfind("/") + 1 :]]
+            return {
+                "path": path,
+                "entries": [
+                    {
+                        "name": "SKILL.md",
+                        "path": f"{clean_path}/SKILL.md",
+                        "kind": "file",
+                        "size": len(s.content)
+                    }
+                ]
+            }
+
         # Also handle listing .ochre root if it exists purely virtually
         if clean_path.endswith("/.ochre"):
              return {
@@ -82,13 +106,13 @@ class SkillsMixin:
         """
         Helper to handle fs_read calls for .ochre/skills/.../SKILL.md
         """
-        clean_path = path
-        
-        for s in skills:
-            # We look for .../.ochre/skills/<name>/SKILL.md
-            suffix = f"/.ochre/skills/{s.name}/SKILL.md"
-            if clean_path.endswith(suffix):
-                return {"path": path, "content": s.content}
-        
+        by_name, _dir_suffixes, file_suffixes = self._skills_index(skills)
+
+        # We look for .../.ochre/skills/<name>/SKILL.md
+        if file_suffixes and path.endswith(file_suffixes):
+            name = path[: -len("/SKILL.md")]
+            s = by_name[name[name.rfind("/") + 1 :]]
+            return {"path": path, "content": s.content}
+
         return None
 
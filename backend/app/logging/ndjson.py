@@ -42,7 +42,7 @@ def _retention_days() -> int:
         return 7
 
 
-def _truncate(v: Any, *, max_len: int = 600) -> Any:
+def _truncate_scalar(v: Any, max_len: int) -> Any:
     if v is None:
         return None
     if isinstance(v, str):
@@ -51,19 +51,40 @@ def _truncate(v: Any, *, max_len: int = 600) -> Any:
         return v[:max_len] + f"...(+{len(v) - max_len} chars)"
     if isinstance(v, (int, float, bool)):
         return v
-    if isinstance(v, dict):
-        out: dict[str, Any] = {}
-        for k, vv in list(v.items())[:80]:
-            out[str(k)] = _truncate(vv, max_len=max_len)
-        if len(v) > 80:
-            out["_truncated_keys"] = len(v) - 80
-        return out
-    if isinstance(v, list):
-        out = [_truncate(x, max_len=max_len) for x in v[:80]]
-        if len(v) > 80:
-            out.append({"_truncated_items": len(v) - 80})
-        return out
-    return _truncate(str(v), max_len=max_len)
+    return _truncate_scalar(str(v), max_len)
+
+
+def _truncate(v: Any, *, max_len: int = 600) -> Any:
+    if not isinstance(v, (dict, list)):
+        return _truncate_scalar(v, max_len)
+
+    # Iterative walk with an explicit stack; recursing would build a Python
+    # frame per nested container, which adds up on deep payloads.
+    root: Any = {} if isinstance(v, dict) else []
+    stack: list[tuple[Any, Any]] = [(v, root)]
+    while stack:
+        src, out = stack.pop()
+        if isinstance(src, dict):
+            for k, vv in list(src.items())[:80]:
+                if isinstance(vv, (dict, list)):
+                    child: Any = {} if isinstance(vv, dict) else []
+                    out[str(k)] = child
+                    stack.append((vv, child))
+                else:
+                    out[str(k)] = _truncate_scalar(vv, max_len)
+            if len(src) > 80:
+                out["_truncated_keys"] = len(src) - 80
+        else:
+            for x in src[:80]:
+                if isinstance(x, (dict, list)):
+                    child = {} if isinstance(x, dict) else []
+                    out.append(child)
+                    stack.append((x, child))
+                else:
+                    out.append(_truncate_scalar(x, max_len))
+            if len(src) > 80:
+                out.append({"_truncated_items": len(src) - 80})
+    return root
 
 
 def _pick_log_file(*, ts: Optional[float] = None) -> Path:
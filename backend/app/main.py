@@ -86,6 +86,15 @@ def create_app() -> FastAPI:
             pass
         log_event(level="info", event="app.startup", data={"ok": True})
 
+    @app.on_event("shutdown")
+    async def shutdown_tasks() -> None:
+        try:
+            from app.notion.client import close_shared_client  # noqa: WPS433
+
+            await close_shared_client()
+        except Exception:
+            pass
+
     app.include_router(fs_router)
     app.include_router(sessions_router)
     app.include_router(session_chat_router)
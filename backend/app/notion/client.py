@@ -15,6 +15,31 @@ class NotionError(RuntimeError):
     pass
 
 
+# Shared across all NotionClient instances so paginated syncs reuse one TCP/TLS
+# connection instead of paying the handshake on every API call.
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def _http() -> httpx.AsyncClient:
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+        )
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """
+    Close the pooled HTTP client; called from the app shutdown hook.
+    """
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
+
+
 class NotionClient:
     def __init__(self) -> None:
         key = notion_api_key()
@@ -30,64 +55,60 @@ class NotionClient:
         payload: dict[str, Any] = {}
         if start_cursor:
             payload["start_cursor"] = start_cursor
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            r = await client.post(
-                f"{NOTION_BASE_URL}/databases/{database_id}/query",
-                headers=self._headers,
-                json=payload,
-            )
-            if r.status_code >= 400:
-                raise NotionError(f"Notion error {r.status_code}: {r.text}")
-            return r.json()
+        r = await _http().post(
+            f"{NOTION_BASE_URL}/databases/{database_id}/query",
+            headers=self._headers,
+            json=payload,
+        )
+        if r.status_code >= 400:
+            raise NotionError(f"Notion error {r.status_code}: {r.text}")
+        return r.json()
 
     async def retrieve_database(self, database_id: str) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            r = await client.get(f"{NOTION_BASE_URL}/databases/{database_id}", headers=self._headers)
-            if r.status_code >= 400:
-                raise NotionError(f"Notion error {r.status_code}: {r.text}")
-            return r.json()
+        r = await _http().get(f"{NOTION_BASE_URL}/databases/{database_id}", headers=self._headers)
+        if r.status_code >= 400:
+            raise NotionError(f"Notion error {r.status_code}: {r.text}")
+        return r.json()
 
     async def update_page_properties(self, page_id: str, *, properties: dict[str, Any]) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            r = await client.patch(
-                f"{NOTION_BASE_URL}/pages/{page_id}",
-                headers=self._headers,
-                json={"properties": properties},
-            )
-            if r.status_code >= 400:
-                raise NotionError(f"Notion error {r.status_code}: {r.text}")
-            return r.json()
-
-    async def list_block_children(self, block_id: str, *, start_cursor: Optional[str] = None) -> dict[str, Any]:
-        params: dict[str, Any] = {}
+        r = await _http().patch(
+            f"{NOTION_BASE_URL}/pages/{page_id}",
+            headers=self._headers,
+            json={"properties": properties},
+        )
+        if r.status_code >= 400:
+            raise NotionError(f"Notion error {r.status_code}: {r.text}")
+        return r.json()
+
+    async def list_block_children(
+        self, block_id: str, *, start_cursor: Optional[str] = None, page_size: int = 100
+    ) -> dict[str, Any]:
+        # Notion defaults to 25 children per page; ask for the max (100) so
+        # long block lists take a quarter of the round trips.
+        params: dict[str, Any] = {"page_size": page_size}
         if start_cursor:
             params["start_cursor"] = start_cursor
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            r = await client.get(
-                f"{NOTION_BASE_URL}/blocks/{block_id}/children",
-                headers=self._headers,
-                params=params,
-            )
-            if r.status_code >= 400:
-                raise NotionError(f"Notion error {r.status_code}: {r.text}")
-            return r.json()
+        r = await _http().get(
+            f"{NOTION_BASE_URL}/blocks/{block_id}/children",
+            headers=self._headers,
+            params=params,
+        )
+        if r.status_code >= 400:
+            raise NotionError(f"Notion error {r.status_code}: {r.text}")
+        return r.json()
 
     async def append_block_children(self, block_id: str, *, children: list[dict[str, Any]]) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            r = await client.patch(
-                f"{NOTION_BASE_URL}/blocks/{block_id}/children",
-                headers=self._headers,
-                json={"children": children},
-            )
-            if r.status_code >= 400:
-                raise NotionError(f"Notion error {r.status_code}: {r.text}")
-            return r.json()
+        r = await _http().patch(
+            f"{NOTION_BASE_URL}/blocks/{block_id}/children",
+            headers=self._headers,
+            json={"children": children},
+        )
+        if r.status_code >= 400:
+            raise NotionError(f"Notion error {r.status_code}: {r.text}")
+        return r.json()
 
     async def delete_block(self, block_id: str) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            r = await client.delete(f"{NOTION_BASE_URL}/blocks/{block_id}", headers=self._headers)
-            if r.status_code >= 400:
-                raise NotionError(f"Notion error {r.status_code}: {r.text}")
-            return r.json()
-
-
+        r = await _http().delete(f"{NOTION_BASE_URL}/blocks/{block_id}", headers=self._headers)
+        if r.status_code >= 400:
+            raise NotionError(f"Notion error {r.status_code}: {r.text}")
+        return r.json()
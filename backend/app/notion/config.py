@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 
 
@@ -11,15 +12,24 @@ def notion_database_id() -> str:
     return os.environ.get("NOTION_DATABASE_ID", "").strip()
 
 
+# Property names are process-stable (env only changes with a restart), so the
+# hot sync path shouldn't pay an env lookup + strip per call.
+@functools.lru_cache(maxsize=1)
 def notion_status_property() -> str:
     return os.environ.get("NOTION_STATUS_PROPERTY", "Status").strip() or "Status"
 
 
+@functools.lru_cache(maxsize=1)
 def notion_tags_property() -> str:
     # Optional, common default.
     return os.environ.get("NOTION_TAGS_PROPERTY", "Tags").strip() or "Tags"
 
 
+def clear_caches() -> None:
+    notion_status_property.cache_clear()
+    notion_tags_property.cache_clear()
+
+
 def is_configured() -> bool:
     return bool(notion_api_key() and notion_database_id())
 
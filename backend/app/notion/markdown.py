@@ -7,6 +7,12 @@ from typing import Any
 
 
 _FM_START_RE = re.compile(r"^\s*---\s*$")
+# Whole-document frontmatter match: opening ---, frontmatter text, closing ---,
+# body. One C-level scan instead of splitlines + line loop + re-join.
+_FM_RE = re.compile(
+    r"\A[^\S\n]*---[^\S\n]*\n(.*?)^[^\S\n]*---[^\S\n]*$\n?(.*)\Z",
+    re.S | re.M,
+)
 _KV_RE = re.compile(r"^\s*(?P<key>[A-Za-z0-9_]+)\s*:\s*(?P<val>.*)\s*$")
 
 
@@ -21,20 +27,21 @@ class CardDoc:
 
 
 def render_card_doc(*, page_id: str, board_id: str, title: str, status: str | None, tags: list[str], body: str) -> str:
-    lines = [
-        "---",
-        f"pageId: {json.dumps(page_id)}",
-        f"boardId: {json.dumps(board_id)}",
-        f"title: {json.dumps(title)}",
-    ]
-    if status is not None:
-        lines.append(f"status: {json.dumps(status)}")
-    lines.append(f"tags: {json.dumps(tags)}")
-    lines.append("---")
-    lines.append("")
-    if body:
-        lines.append(body.rstrip() + "\n")
-    return "\n".join(lines)
+    # Assembled as a handful of f-string pieces instead of a list + join; the
+    # dumps local skips the module attribute lookup per field in bulk exports.
+    dumps = json.dumps
+    status_line = f"status: {dumps(status)}\n" if status is not None else ""
+    body_part = f"\n{body.rstrip()}\n" if body else ""
+    return (
+        f"---\n"
+        f"pageId: {dumps(page_id)}\n"
+        f"boardId: {dumps(board_id)}\n"
+        f"title: {dumps(title)}\n"
+        f"{status_line}"
+        f"tags: {dumps(tags)}\n"
+        f"---\n"
+        f"{body_part}"
+    )
 
 
 def parse_card_doc(md: str) -> CardDoc:
@@ -43,21 +50,20 @@ def parse_card_doc(md: str) -> CardDoc:
     - Requires starting `---` and ending `---`
     - Supports key: "string" and tags: ["a","b"] (JSON-ish list) or tags: [a,b]
     """
-    lines = md.splitlines()
-    if not lines or not _FM_START_RE.match(lines[0]):
-        raise ValueError("Missing frontmatter start (---)")
-    end_idx = None
-    for i in range(1, len(lines)):
-        if _FM_START_RE.match(lines[i]):
-            end_idx = i
-            break
-    if end_idx is None:
+    m_doc = _FM_RE.match(md)
+    if m_doc is None:
+        first_line = md.split("\n", 1)[0]
+        if not _FM_START_RE.match(first_line):
+            raise ValueError("Missing frontmatter start (---)")
         raise ValueError("Missing frontmatter end (---)")
 
-    fm_lines = lines[1:end_idx]
-    body = "\n".join(lines[end_idx + 1 :]).lstrip("\n")
+    fm_text = m_doc.group(1)
+    body = m_doc.group(2)
+    if body.endswith("\n"):
+        body = body[:-1]
+    body = body.lstrip("\n")
     data: dict[str, Any] = {}
-    for l in fm_lines:
+    for l in fm_text.splitlines():
         m = _KV_RE.match(l)
         if not m:
             continue
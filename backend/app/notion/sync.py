@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import json
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Optional
 from uuid import uuid4
 
-from app.db import connect
+from app._json import dumps as json_dumps, loads as json_loads
+from app.db import pooled, retry_on_busy
 from app.notion.client import NotionClient, NotionError
 from app.notion.config import notion_status_property, notion_tags_property
 from app.notion.markdown import parse_card_doc
@@ -19,20 +21,35 @@ def _now_iso() -> str:
 
 async def _list_all_children(client: NotionClient, block_id: str) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
-    cursor: Optional[str] = None
+    res = await client.list_block_children(block_id)
     while True:
-        res = await client.list_block_children(block_id, start_cursor=cursor)
+        # Kick off the next page before processing this one so the HTTP round
+        # trip overlaps with our own work on the results.
+        nxt: Optional[asyncio.Task[dict[str, Any]]] = None
+        if res.get("has_more"):
+            nxt = asyncio.create_task(
+                client.list_block_children(block_id, start_cursor=res.get("next_cursor"))
+            )
         out.extend(res.get("results") or [])
-        if not res.get("has_more"):
-            break
-        cursor = res.get("next_cursor")
-    return out
+        if nxt is None:
+            return out
+        res = await nxt
 
 
 def _rt_plain(text: str) -> list[dict[str, Any]]:
     return [{"type": "text", "text": {"content": text}}]
 
 
+def _body_code_block(body_md: str) -> dict[str, Any]:
+    return {
+        "type": "code",
+        "code": {
+            "rich_text": _rt_plain(body_md or ""),
+            "language": "markdown",
+        },
+    }
+
+
 async def _ensure_ochre_body_section(*, client: NotionClient, page_id: str, body_md: str) -> dict[str, Any]:
     """
     Ensure a dedicated 'Ochre Body' section exists, and overwrite its children with a single markdown code block.
@@ -48,12 +65,21 @@ async def _ensure_ochre_body_section(*, client: NotionClient, page_id: str, body
         if b.get("type") != "toggle":
             continue
         t = (b.get("toggle") or {}).get("rich_text") or []
-        plain = "".join([x.get("plain_text", "") for x in t if isinstance(x, dict)])
+        # Notion keeps the toggle title in the first rich_text item, so check
+        # it directly and only fall back to joining the rest (a generator, no
+        # intermediate list) when the title is split across items.
+        first = t[0].get("plain_text", "") if t and isinstance(t[0], dict) else ""
+        plain = first
+        if not first.strip().lower().startswith("ochre body") and len(t) > 1:
+            plain = "".join(x.get("plain_text", "") for x in t if isinstance(x, dict))
         if plain.strip().lower().startswith("ochre body"):
             ochre_toggle_id = b.get("id")
             break
 
     if not ochre_toggle_id:
+        # Fresh create: nest the code block inside the toggle's children so
+        # the whole section lands in one request — no re-list, no delete pass,
+        # no second append.
         created = await client.append_block_children(
             page_id,
             children=[
@@ -61,49 +87,37 @@ async def _ensure_ochre_body_section(*, client: NotionClient, page_id: str, body
                     "type": "toggle",
                     "toggle": {
                         "rich_text": _rt_plain("Ochre Body"),
-                        "children": [],
+                        "children": [_body_code_block(body_md)],
                     },
                 }
             ],
         )
-        # Find the created block id by re-listing last page children.
-        children2 = await _list_all_children(client, page_id)
-        for b in reversed(children2):
+        # The append endpoint returns the created blocks; no need to re-list
+        # the whole page to find the new toggle's id.
+        for b in created.get("results") or []:
             if isinstance(b, dict) and b.get("type") == "toggle":
-                t = (b.get("toggle") or {}).get("rich_text") or []
-                plain = "".join([x.get("plain_text", "") for x in t if isinstance(x, dict)])
-                if plain.strip() == "Ochre Body":
-                    ochre_toggle_id = b.get("id")
-                    break
+                ochre_toggle_id = b.get("id")
+                break
+        if not ochre_toggle_id:
+            raise RuntimeError("Failed to create/find Ochre Body section")
+        return {"toggleId": ochre_toggle_id, "deleted": 0}
+
+    # Delete existing children under the toggle. The deletes are independent,
+    # so run them concurrently (bounded to stay under Notion's rate limit)
+    # instead of paying one serial round trip per block.
+    existing = await _list_all_children(client, ochre_toggle_id)
+    ids = [ch.get("id") for ch in existing if isinstance(ch, dict) and ch.get("id")]
+    sem = asyncio.Semaphore(5)
 
-    if not ochre_toggle_id:
-        raise RuntimeError("Failed to create/find Ochre Body section")
+    async def _delete(cid: str) -> None:
+        async with sem:
+            await client.delete_block(cid)
 
-    # Delete existing children under the toggle.
-    existing = await _list_all_children(client, ochre_toggle_id)
-    deleted = 0
-    for ch in existing:
-        cid = ch.get("id") if isinstance(ch, dict) else None
-        if cid:
-            try:
-                await client.delete_block(cid)
-                deleted += 1
-            except Exception:
-                pass
+    results = await asyncio.gather(*(_delete(cid) for cid in ids), return_exceptions=True)
+    deleted = sum(1 for r in results if not isinstance(r, BaseException))
 
     # Append a single code block containing the markdown body.
-    await client.append_block_children(
-        ochre_toggle_id,
-        children=[
-            {
-                "type": "code",
-                "code": {
-                    "rich_text": _rt_plain(body_md or ""),
-                    "language": "markdown",
-                },
-            }
-        ],
-    )
+    await client.append_block_children(ochre_toggle_id, children=[_body_code_block(body_md)])
     return {"toggleId": ochre_toggle_id, "deleted": deleted}
 
 
@@ -113,15 +127,46 @@ class SyncJob:
     board_id: str
     card_id: str
     kind: str
-    payload: dict[str, Any]
+    payload_json: str
     status: str
     created_at: str
     updated_at: str
     error: Optional[str]
 
-
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        # Parsed on first access only; enqueue/pick paths never need the dict.
+        raw = self.payload_json or "{}"
+        try:
+            payload = json_loads(raw)
+        except Exception:
+            return {"_raw": raw}
+        return payload if isinstance(payload, dict) else {"payload": payload}
+
+    def to_dict(self) -> dict[str, Any]:
+        # API shape: callers expect the parsed payload dict, not the raw
+        # payload_json string (__dict__ would also leak the cached_property).
+        return {
+            "id": self.id,
+            "board_id": self.board_id,
+            "card_id": self.card_id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
+
+
+@retry_on_busy
 def enqueue_update_from_overlay(*, board_id: str, card_id: str, overlay_md: str) -> SyncJob:
     doc = parse_card_doc(overlay_md)
+    # Bind the parsed fields once; the log data and payload both need them.
+    title = doc.title
+    status = doc.status
+    tags = doc.tags or []
+    body = doc.body or ""
     log_event(
         level="info",
         event="notion.sync.enqueue",
@@ -130,63 +175,80 @@ def enqueue_update_from_overlay(*, board_id: str, card_id: str, overlay_md: str)
             "boardId": board_id,
             "cardId": card_id,
             "pageId": doc.page_id,
-            "titleLen": len(doc.title or ""),
-            "status": doc.status,
-            "tagsCount": len(doc.tags or []),
-            "bodyLen": len(doc.body or ""),
+            "titleLen": len(title or ""),
+            "status": status,
+            "tagsCount": len(tags),
+            "bodyLen": len(body),
         },
     )
     payload = {
         "pageId": doc.page_id,
-        "title": doc.title,
-        "status": doc.status,
+        "title": title,
+        "status": status,
         "tags": doc.tags,
         "body": doc.body,
     }
     jid = str(uuid4())
     now = _now_iso()
-    conn = connect()
-    try:
-        conn.execute(
-            "INSERT INTO notion_sync_jobs(id, board_id, card_id, kind, payload_json, status, created_at, updated_at, error) "
-            "VALUES(?, ?, ?, ?, ?, ?, ?, ?, NULL)",
-            (jid, board_id, card_id, "update_properties", json.dumps(payload, ensure_ascii=False), "queued", now, now),
-        )
-        conn.commit()
-        row = conn.execute("SELECT * FROM notion_sync_jobs WHERE id=?", (jid,)).fetchone()
-        assert row is not None
-        return _row_to_job(row)
-    finally:
-        conn.close()
+    payload_json = json_dumps(payload)
+    conn = pooled()
+    conn.execute(
+        "INSERT INTO notion_sync_jobs(id, board_id, card_id, kind, payload_json, status, created_at, updated_at, error) "
+        "VALUES(?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+        (jid, board_id, card_id, "update_properties", payload_json, "queued", now, now),
+    )
+    conn.commit()
+    # Every field is already known; no need to SELECT the row back.
+    return SyncJob(
+        id=jid,
+        board_id=board_id,
+        card_id=card_id,
+        kind="update_properties",
+        payload_json=payload_json,
+        status="queued",
+        created_at=now,
+        updated_at=now,
+        error=None,
+    )
+
+
+@retry_on_busy
+def _pick_next_job() -> Optional[SyncJob]:
+    conn = pooled()
+    # Claim in one atomic statement (SQLite >= 3.35 RETURNING): no separate
+    # SELECT + UPDATE round trips, and no window where two workers could pick
+    # the same queued job.
+    row = conn.execute(
+        "UPDATE notion_sync_jobs SET status='running', updated_at=? "
+        "WHERE id = (SELECT id FROM notion_sync_jobs WHERE status='queued' ORDER BY created_at ASC LIMIT 1) "
+        "RETURNING *",
+        (_now_iso(),),
+    ).fetchone()
+    conn.commit()
+    if not row:
+        return None
+    job = _row_to_job(row)
+    log_event(level="info", event="notion.sync.job.picked", jobId=job.id, data={"boardId": job.board_id, "cardId": job.card_id, "kind": job.kind})
+    return job
 
 
 async def process_next_job() -> Optional[SyncJob]:
-    conn = connect()
-    try:
-        row = conn.execute(
-            "SELECT * FROM notion_sync_jobs WHERE status='queued' ORDER BY created_at ASC LIMIT 1"
-        ).fetchone()
-        if not row:
-            return None
-        job = _row_to_job(row)
-        log_event(level="info", event="notion.sync.job.picked", jobId=job.id, data={"boardId": job.board_id, "cardId": job.card_id, "kind": job.kind})
-        conn.execute(
-            "UPDATE notion_sync_jobs SET status='running', updated_at=? WHERE id=?",
-            (_now_iso(), job.id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    # SQLite writes (and their fsyncs) run in worker threads so they don't
+    # stall other tasks on the event loop; pooled() is thread-local, so each
+    # worker thread gets its own connection.
+    job = await asyncio.to_thread(_pick_next_job)
+    if job is None:
+        return None
 
     try:
         log_event(level="info", event="notion.sync.job.apply.start", jobId=job.id, data={"boardId": job.board_id, "cardId": job.card_id})
         await _apply_job(job)
         log_event(level="info", event="notion.sync.job.apply.ok", jobId=job.id, data={"boardId": job.board_id, "cardId": job.card_id})
-        _mark_job_done(job.id)
+        await asyncio.to_thread(_mark_job_done, job.id)
         return job
     except Exception as e:  # noqa: BLE001
         log_event(level="error", event="notion.sync.job.apply.failed", jobId=job.id, data={"boardId": job.board_id, "cardId": job.card_id, "error": str(e)})
-        _mark_job_failed(job.id, str(e))
+        await asyncio.to_thread(_mark_job_failed, job.id, str(e))
         return job
 
 
@@ -235,57 +297,48 @@ async def _apply_job(job: SyncJob) -> None:
         raise
 
     # Update cache snapshot fields optimistically.
-    conn = connect()
-    try:
-        conn.execute(
-            "UPDATE notion_cards SET title=?, status=?, tags_json=?, cached_at=? WHERE id=? AND board_id=?",
-            (title, status, json.dumps(tags, ensure_ascii=False), _now_iso(), job.card_id, job.board_id),
-        )
-        conn.execute(
-            "UPDATE notion_cards SET body_md=? WHERE id=? AND board_id=?",
-            (str(body), job.card_id, job.board_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    await asyncio.to_thread(_update_card_snapshot, job, title, status, tags, str(body))
+
+
+@retry_on_busy
+def _update_card_snapshot(job: SyncJob, title: Any, status: Any, tags: Any, body: str) -> None:
+    conn = pooled()
+    # One UPDATE for the whole snapshot: a single row lookup and WAL frame.
+    conn.execute(
+        "UPDATE notion_cards SET title=?, status=?, tags_json=?, body_md=?, cached_at=? "
+        "WHERE id=? AND board_id=?",
+        (title, status, json_dumps(tags), body, _now_iso(), job.card_id, job.board_id),
+    )
+    conn.commit()
 
 
+@retry_on_busy
 def _mark_job_done(job_id: str) -> None:
-    conn = connect()
-    try:
-        conn.execute(
-            "UPDATE notion_sync_jobs SET status='done', updated_at=?, error=NULL WHERE id=?",
-            (_now_iso(), job_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    conn = pooled()
+    conn.execute(
+        "UPDATE notion_sync_jobs SET status='done', updated_at=?, error=NULL WHERE id=?",
+        (_now_iso(), job_id),
+    )
+    conn.commit()
 
 
+@retry_on_busy
 def _mark_job_failed(job_id: str, error: str) -> None:
-    conn = connect()
-    try:
-        conn.execute(
-            "UPDATE notion_sync_jobs SET status='failed', updated_at=?, error=? WHERE id=?",
-            (_now_iso(), error, job_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    conn = pooled()
+    conn.execute(
+        "UPDATE notion_sync_jobs SET status='failed', updated_at=?, error=? WHERE id=?",
+        (_now_iso(), error, job_id),
+    )
+    conn.commit()
 
 
 def _row_to_job(row: Any) -> SyncJob:
-    payload_raw = row["payload_json"] or "{}"
-    try:
-        payload = json.loads(payload_raw)
-    except Exception:
-        payload = {"_raw": payload_raw}
     return SyncJob(
         id=row["id"],
         board_id=row["board_id"],
         card_id=row["card_id"],
         kind=row["kind"],
-        payload=payload if isinstance(payload, dict) else {"payload": payload},
+        payload_json=row["payload_json"] or "{}",
         status=row["status"],
         created_at=row["created_at"],
         updated_at=row["updated_at"],
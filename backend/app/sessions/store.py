@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import Any, Optional
 from uuid import uuid4
 
-from app.db import connect
+from app._json import dumps as json_dumps, loads as json_loads
+from app.db import pooled, retry_on_busy
 
 
 @dataclass
@@ -26,52 +26,48 @@ class MessageRow:
     meta: dict[str, Any]
 
 
+def _row_to_session(row: Any) -> SessionRow:
+    # Positional construction skips the per-row dict that **dict(row) builds.
+    return SessionRow(row["id"], row["title"], row["created_at"], row["last_active_at"])
+
+
+@retry_on_busy
 def create_session(*, title: Optional[str] = None) -> SessionRow:
     sid = str(uuid4())
-    conn = connect()
-    try:
-        conn.execute(
-            "INSERT INTO sessions(id, title, created_at, last_active_at) VALUES(?, ?, datetime('now'), datetime('now'))",
-            (sid, title),
-        )
-        conn.commit()
-        row = conn.execute("SELECT * FROM sessions WHERE id=?", (sid,)).fetchone()
-        assert row is not None
-        return SessionRow(**dict(row))
-    finally:
-        conn.close()
+    conn = pooled()
+    conn.execute(
+        "INSERT INTO sessions(id, title, created_at, last_active_at) VALUES(?, ?, datetime('now'), datetime('now'))",
+        (sid, title),
+    )
+    conn.commit()
+    row = conn.execute("SELECT * FROM sessions WHERE id=?", (sid,)).fetchone()
+    assert row is not None
+    return _row_to_session(row)
 
 
 def list_sessions(*, limit: int = 50) -> list[SessionRow]:
-    conn = connect()
-    try:
-        rows = conn.execute(
-            "SELECT * FROM sessions ORDER BY last_active_at DESC LIMIT ?",
-            (limit,),
-        ).fetchall()
-        return [SessionRow(**dict(r)) for r in rows]
-    finally:
-        conn.close()
+    conn = pooled()
+    rows = conn.execute(
+        "SELECT * FROM sessions ORDER BY last_active_at DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+    return [_row_to_session(r) for r in rows]
 
 
 def get_session(session_id: str) -> Optional[SessionRow]:
-    conn = connect()
-    try:
-        row = conn.execute("SELECT * FROM sessions WHERE id=?", (session_id,)).fetchone()
-        return SessionRow(**dict(row)) if row else None
-    finally:
-        conn.close()
+    conn = pooled()
+    row = conn.execute("SELECT * FROM sessions WHERE id=?", (session_id,)).fetchone()
+    return _row_to_session(row) if row else None
 
 
+@retry_on_busy
 def touch_session(session_id: str) -> None:
-    conn = connect()
-    try:
-        conn.execute("UPDATE sessions SET last_active_at=datetime('now') WHERE id=?", (session_id,))
-        conn.commit()
-    finally:
-        conn.close()
+    conn = pooled()
+    conn.execute("UPDATE sessions SET last_active_at=datetime('now') WHERE id=?", (session_id,))
+    conn.commit()
 
 
+@retry_on_busy
 def add_message(
     *,
     session_id: str,
@@ -80,66 +76,114 @@ def add_message(
     meta: Optional[dict[str, Any]] = None,
 ) -> MessageRow:
     mid = str(uuid4())
-    meta_json = json.dumps(meta or {}, ensure_ascii=False)
-    conn = connect()
-    try:
-        conn.execute(
+    meta_json = json_dumps(meta or {})
+    conn = pooled()
+    # INSERT ... RETURNING avoids the readback SELECT, and the `with conn:`
+    # block commits both writes with one flush.
+    with conn:
+        row = conn.execute(
             "INSERT INTO messages(id, session_id, role, content, created_at, meta_json) "
-            "VALUES(?, ?, ?, ?, datetime('now'), ?)",
+            "VALUES(?, ?, ?, ?, datetime('now'), ?) "
+            "RETURNING id, session_id, role, content, created_at, meta_json",
             (mid, session_id, role, content, meta_json),
+        ).fetchone()
+        conn.execute("UPDATE sessions SET last_active_at=datetime('now') WHERE id=?", (session_id,))
+    assert row is not None
+    return _row_to_message(row)
+
+
+@retry_on_busy
+def add_messages_bulk(session_id: str, items: list[dict[str, Any]]) -> list[MessageRow]:
+    """
+    Insert several messages in one transaction. executemany amortizes the
+    statement parse and the commit fsync over the batch, and the session's
+    last_active_at is bumped once at the end.
+
+    Each item: {"role": str, "content": Optional[str], "meta": Optional[dict]}.
+    """
+    if not items:
+        return []
+    rows = [
+        (
+            str(uuid4()),
+            session_id,
+            str(item["role"]),
+            item.get("content"),
+            json_dumps(item.get("meta") or {}),
+        )
+        for item in items
+    ]
+    conn = pooled()
+    with conn:
+        conn.executemany(
+            "INSERT INTO messages(id, session_id, role, content, created_at, meta_json) "
+            "VALUES(?, ?, ?, ?, datetime('now'), ?)",
+            rows,
         )
         conn.execute("UPDATE sessions SET last_active_at=datetime('now') WHERE id=?", (session_id,))
-        conn.commit()
-        row = conn.execute("SELECT * FROM messages WHERE id=?", (mid,)).fetchone()
-        assert row is not None
-        return _row_to_message(row)
-    finally:
-        conn.close()
+    ids = [r[0] for r in rows]
+    placeholders = ",".join("?" * len(ids))
+    out = conn.execute(
+        f"SELECT * FROM messages WHERE id IN ({placeholders}) ORDER BY created_at ASC",
+        ids,
+    ).fetchall()
+    by_id = {r["id"]: _row_to_message(r) for r in out}
+    return [by_id[i] for i in ids]
 
 
+@retry_on_busy
 def update_message_content(message_id: str, *, content: str, meta: Optional[dict[str, Any]] = None) -> None:
     """
     Update content (and optionally meta_json) for an existing message.
     Useful for persisting partial assistant output on cancellation.
     """
-    conn = connect()
-    try:
-        if meta is None:
-            conn.execute("UPDATE messages SET content=? WHERE id=?", (content, message_id))
-        else:
-            # Merge meta into existing meta_json rather than overwriting it.
-            # This prevents accidental loss of fields like assistant tool_calls, which must stay linked to tool outputs.
-            try:
-                row = conn.execute("SELECT meta_json FROM messages WHERE id=?", (message_id,)).fetchone()
-                existing_raw = (row["meta_json"] if row else None) or "{}"
-                existing = json.loads(existing_raw)
-                existing = existing if isinstance(existing, dict) else {"meta": existing}
-            except Exception:
-                existing = {}
-            merged = {**existing, **(meta or {})}
-            meta_json = json.dumps(merged, ensure_ascii=False)
-            conn.execute("UPDATE messages SET content=?, meta_json=? WHERE id=?", (content, meta_json, message_id))
-        conn.commit()
-    finally:
-        conn.close()
+    conn = pooled()
+    if meta is None:
+        conn.execute("UPDATE messages SET content=? WHERE id=?", (content, message_id))
+    elif any(v is None or isinstance(v, dict) for v in meta.values()):
+        # json_patch is RFC 7386: a None value would DELETE the key and a dict
+        # value would deep-merge into the existing dict, neither of which is
+        # the top-level {**existing, **meta} replace this function promises.
+        # For those metas, do the merge in Python like before.
+        try:
+            row = conn.execute("SELECT meta_json FROM messages WHERE id=?", (message_id,)).fetchone()
+            existing_raw = (row["meta_json"] if row else None) or "{}"
+            existing = json_loads(existing_raw)
+            existing = existing if isinstance(existing, dict) else {"meta": existing}
+        except Exception:
+            existing = {}
+        conn.execute(
+            "UPDATE messages SET content=?, meta_json=? WHERE id=?",
+            (content, json_dumps({**existing, **meta}), message_id),
+        )
+    else:
+        # Merge meta into existing meta_json rather than overwriting it.
+        # This prevents accidental loss of fields like assistant tool_calls, which must stay linked to tool outputs.
+        # json_patch does the merge inside SQLite — no SELECT + Python JSON
+        # round trip per update. Safe here: with no None and no dict values
+        # (checked above), RFC 7386 patching degenerates to a shallow merge.
+        conn.execute(
+            "UPDATE messages SET content=?, "
+            "meta_json=json_patch(CASE WHEN json_valid(coalesce(meta_json, '{}')) THEN coalesce(meta_json, '{}') ELSE '{}' END, ?) "
+            "WHERE id=?",
+            (content, json_dumps(meta), message_id),
+        )
+    conn.commit()
 
 
 def list_messages(session_id: str, *, limit: int = 200) -> list[MessageRow]:
-    conn = connect()
-    try:
-        rows = conn.execute(
-            "SELECT * FROM messages WHERE session_id=? ORDER BY created_at ASC LIMIT ?",
-            (session_id, limit),
-        ).fetchall()
-        return [_row_to_message(r) for r in rows]
-    finally:
-        conn.close()
+    conn = pooled()
+    rows = conn.execute(
+        "SELECT * FROM messages WHERE session_id=? ORDER BY created_at ASC LIMIT ?",
+        (session_id, limit),
+    ).fetchall()
+    return [_row_to_message(r) for r in rows]
 
 
 def _row_to_message(row: Any) -> MessageRow:
     meta_raw = row["meta_json"] or "{}"
     try:
-        meta = json.loads(meta_raw)
+        meta = json_loads(meta_raw)
     except Exception:
         meta = {"_raw": meta_raw}
     return MessageRow(
@@ -153,34 +197,59 @@ def _row_to_message(row: Any) -> MessageRow:
 
 
 def messages_for_llm(session_id: str, *, limit: int = 200) -> list[dict[str, Any]]:
-    msgs = list_messages(session_id, limit=limit)
+    # Extract the tool-linkage fields with json_extract so SQLite's C JSON1
+    # parser does the work; Python only parses tool_calls for the assistant
+    # rows that actually carry them, and discarded tool rows never become
+    # MessageRow objects at all. json_extract raises on malformed JSON, so
+    # guard with json_valid like _row_to_message tolerates bad meta_json —
+    # one corrupt row must not take the whole history fetch down. NULL
+    # meta_json fails json_valid and yields NULL, same as before.
+    conn = pooled()
+    rows = conn.execute(
+        "SELECT role, content, "
+        "CASE WHEN json_valid(meta_json) THEN json_extract(meta_json, '$.name') END AS name, "
+        "CASE WHEN json_valid(meta_json) THEN json_extract(meta_json, '$.tool_call_id') END AS tcid, "
+        "CASE WHEN json_valid(meta_json) THEN json_extract(meta_json, '$.tool_calls') END AS tcs "
+        "FROM messages WHERE session_id=? ORDER BY created_at ASC LIMIT ?",
+        (session_id, limit),
+    ).fetchall()
+
     # Only include tool outputs that have a corresponding assistant tool_call id in the same history.
     # Providers reject tool outputs that can't be linked to a tool call ("No tool call found for ... call_id").
     valid_call_ids: set[str] = set()
-    for m in msgs:
-        if m.role != "assistant":
-            continue
-        tc = (m.meta or {}).get("tool_calls")
-        if not isinstance(tc, list):
-            continue
-        for item in tc:
-            if isinstance(item, dict):
-                cid = item.get("id")
-                if isinstance(cid, str) and cid:
-                    valid_call_ids.add(cid)
+    parsed_tcs: list[Optional[list[Any]]] = []
+    for r in rows:
+        tc: Optional[list[Any]] = None
+        if r["role"] == "assistant" and r["tcs"]:
+            try:
+                loaded = json_loads(r["tcs"])
+            except Exception:
+                loaded = None
+            if isinstance(loaded, list):
+                tc = loaded
+                for item in tc:
+                    if isinstance(item, dict):
+                        cid = item.get("id")
+                        if isinstance(cid, str) and cid:
+                            valid_call_ids.add(cid)
+        parsed_tcs.append(tc)
+
     out: list[dict[str, Any]] = []
-    for m in msgs:
-        if m.role == "tool":
-            tcid = (m.meta or {}).get("tool_call_id")
+    for r, tc in zip(rows, parsed_tcs):
+        if r["role"] == "tool":
+            tcid = r["tcid"]
             if not (isinstance(tcid, str) and tcid and tcid in valid_call_ids):
                 continue
-        d: dict[str, Any] = {"role": m.role}
-        if m.content is not None:
-            d["content"] = m.content
+        d: dict[str, Any] = {"role": r["role"]}
+        if r["content"] is not None:
+            d["content"] = r["content"]
         # carry through known tool fields if present
-        for k in ("name", "tool_call_id", "tool_calls"):
-            if k in m.meta:
-                d[k] = m.meta[k]
+        if r["name"] is not None:
+            d["name"] = r["name"]
+        if r["tcid"] is not None:
+            d["tool_call_id"] = r["tcid"]
+        if tc is not None:
+            d["tool_calls"] = tc
         out.append(d)
     return out
 
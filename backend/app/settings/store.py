@@ -2,27 +2,22 @@ from __future__ import annotations
 
 from typing import Optional
 
-from app.db import connect
+from app.db import pooled, retry_on_busy
 
 
 def get_setting(key: str, default: Optional[str] = None) -> Optional[str]:
-    conn = connect()
-    try:
-        row = conn.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
-        return str(row["value"]) if row else default
-    finally:
-        conn.close()
+    conn = pooled()
+    row = conn.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
+    return str(row["value"]) if row else default
 
 
+@retry_on_busy
 def set_setting(key: str, value: str) -> None:
-    conn = connect()
-    try:
-        conn.execute(
-            "INSERT INTO settings(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-            (key, value),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    conn = pooled()
+    conn.execute(
+        "INSERT INTO settings(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+        (key, value),
+    )
+    conn.commit()
 
 
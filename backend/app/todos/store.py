@@ -1,16 +1,30 @@
 from __future__ import annotations
 
 import json
+import os
 import re
-from dataclasses import asdict, dataclass
-from datetime import date, datetime
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional
-from uuid import uuid4
+from uuid import UUID, uuid4
 
+try:
+    import orjson
+except Exception:  # noqa: BLE001
+    orjson = None  # type: ignore[assignment]
 
+
+# [^\S\n] = whitespace except newline, so a match can never span lines under
+# MULTILINE. Groups are positional: 1=done char, 2=text, 3=id.
 _TASK_LINE_RE = re.compile(
-    r"^\s*-\s*\[(?P<done>[ xX])\]\s*(?P<text>.*?)\s*(?:<!--\s*id:(?P<id>[A-Za-z0-9_-]+)\s*-->)?\s*$"
+    r"^[^\S\n]*-[^\S\n]*\[([ xX])\][^\S\n]*(.*?)[^\S\n]*"
+    r"(?:<!--[^\S\n]*id:([A-Za-z0-9_-]+)[^\S\n]*-->)?[^\S\n]*$",
+    # Task-line structure is pure ASCII; re.ASCII keeps \S out of the Unicode
+    # property tables (task text itself still matches any characters via .).
+    re.ASCII | re.MULTILINE,
 )
 
 
@@ -18,7 +32,13 @@ def _now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
-@dataclass
+def _new_ids(n: int) -> list[str]:
+    # One urandom read for the whole batch instead of one per uuid4() call.
+    blob = os.urandom(16 * n)
+    return [str(UUID(bytes=blob[i : i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
+@dataclass(slots=True)
 class Task:
     id: str
     text: str
@@ -26,42 +46,89 @@ class Task:
     created_at: str
     updated_at: str
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "text": self.text,
+            "done": self.done,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
 
 class TodoError(RuntimeError):
     pass
 
 
+# backend/app/todos/store.py -> backend/. resolve() costs realpath syscalls,
+# so do it once at import rather than on every path helper call.
+_DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "todos"
+_TEMPLATE_PATH = _DATA_DIR / "template.todo.md"
+
+
 def data_dir() -> Path:
-    # backend/app/todos/store.py -> backend/
-    backend_dir = Path(__file__).resolve().parents[2]
-    return backend_dir / "data" / "todos"
+    return _DATA_DIR
 
 
 def template_path() -> Path:
-    return data_dir() / "template.todo.md"
+    return _TEMPLATE_PATH
 
 
 def day_json_path(day: str) -> Path:
     return data_dir() / f"{day}.json"
 
 
+# (expiry epoch seconds, "YYYY-MM-DD"). Formatting the date is redone only
+# after local midnight passes; until then today_str is one time() call and a
+# comparison. Tuple assignment keeps the update atomic under the GIL.
+_TODAY_CACHE: tuple[float, str] = (0.0, "")
+
+
 def today_str() -> str:
-    return date.today().isoformat()
+    global _TODAY_CACHE
+    now = time.time()
+    expires, s = _TODAY_CACHE
+    if now < expires:
+        return s
+    d = date.today()
+    s = d.isoformat()
+    # Naive datetime -> .timestamp() resolves in the local timezone, so the
+    # expiry lands on the next local midnight (DST shifts included).
+    midnight = datetime.combine(d + timedelta(days=1), datetime.min.time()).timestamp()
+    _TODAY_CACHE = (midnight, s)
+    return s
+
+
+_dirs_ready = False
 
 
 def _ensure_dirs() -> None:
+    # The mkdir is only needed once per process; afterwards this is a bool
+    # check instead of a stat+mkdir syscall pair on every load/save.
+    global _dirs_ready
+    if _dirs_ready:
+        return
     data_dir().mkdir(parents=True, exist_ok=True)
+    _dirs_ready = True
+
+
+_TEMPLATE_BYTES = (
+    "# Template\n\n- [ ] Review today’s priorities\n- [ ] Triage inbox\n- [ ] One meaningful task\n\n## Notes\n"
+).encode("utf-8")
 
 
 def ensure_template_exists() -> None:
     _ensure_dirs()
-    p = template_path()
-    if p.exists():
+    # O_EXCL makes create-if-missing race-safe and replaces the exists()
+    # pre-check (one stat) and the text-IO layer (encode + buffered write).
+    try:
+        fd = os.open(template_path(), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
         return
-    p.write_text(
-        "# Template\n\n- [ ] Review today’s priorities\n- [ ] Triage inbox\n- [ ] One meaningful task\n\n## Notes\n",
-        encoding="utf-8",
-    )
+    try:
+        os.write(fd, _TEMPLATE_BYTES)
+    finally:
+        os.close(fd)
 
 
 def parse_markdown_tasks(md: str) -> list[tuple[Optional[str], str, bool]]:
@@ -69,51 +136,59 @@ def parse_markdown_tasks(md: str) -> list[tuple[Optional[str], str, bool]]:
     Returns tuples: (id|None, text, done).
     Only lines that look like task checkboxes are parsed.
     """
+    # One MULTILINE scan over the buffer; no intermediate splitlines() list.
+    # Positional group access skips the group-name lookup per field.
     out: list[tuple[Optional[str], str, bool]] = []
-    for line in md.splitlines():
-        m = _TASK_LINE_RE.match(line)
-        if not m:
-            continue
-        text = (m.group("text") or "").strip()
+    for m in _TASK_LINE_RE.finditer(md):
+        done_c, text, tid = m.group(1, 2, 3)
+        text = text.strip()
         if not text:
             continue
-        done = (m.group("done") or " ").lower() == "x"
-        out.append((m.group("id"), text, done))
+        out.append((tid, text, done_c in ("x", "X")))
     return out
 
 
+_NOTES_MARKER = "\n## Notes"
+
+
 def extract_notes_content(md: str) -> str:
-    # We look for a line that is exactly "## Notes" or starts with "## Notes"
-    # For simplicity, let's split on "\n## Notes"
-    if "\n## Notes" in md:
-        _, notes = md.split("\n## Notes", 1)
-        return notes.strip()
-    return ""
+    # We look for a line that is exactly "## Notes" or starts with "## Notes".
+    # One find + slice: no separate `in` scan and no throwaway head string.
+    idx = md.find(_NOTES_MARKER)
+    if idx < 0:
+        return ""
+    return md[idx + len(_NOTES_MARKER):].strip()
 
 
 def render_markdown(day: str, tasks: list[Task], notes: str) -> str:
-    lines = [f"# Todos: {day}", ""]
-    for t in tasks:
-        box = "x" if t.done else " "
-        lines.append(f"- [{box}] {t.text} <!-- id:{t.id} -->")
-    
+    # Join a generator instead of growing a lines list; output is unchanged.
+    body = "\n".join(f"- [{'x' if t.done else ' '}] {t.text} <!-- id:{t.id} -->" for t in tasks)
     if notes:
-        lines.append("")
-        lines.append("## Notes")
-        lines.append(notes)
-    elif not tasks and not notes:
-        lines.append("(No tasks)")
-    
-    lines.append("")
-    return "\n".join(lines)
+        sep = "\n\n" if tasks else "\n"
+        return f"# Todos: {day}\n\n{body}{sep}## Notes\n{notes}\n"
+    if not tasks:
+        return f"# Todos: {day}\n\n(No tasks)\n"
+    return f"# Todos: {day}\n\n{body}\n"
 
 
-def load_day(day: str) -> tuple[list[Task], str]:
-    _ensure_dirs()
-    p = day_json_path(day)
-    if not p.exists():
-        ensure_day(day)
-    raw = json.loads(p.read_text(encoding="utf-8"))
+# path -> (mtime_ns, tasks tuple, notes, by_id). Keyed by mtime so external
+# edits miss naturally; save_day primes the entry with the value it just
+# wrote, so the read-after-write that every mutation endpoint does never
+# re-parses. Tasks are never mutated in place (every edit builds fresh Task
+# objects), so sharing the cached tuple/index across callers is safe.
+_DAY_CACHE: OrderedDict[str, tuple[int, tuple[Task, ...], str, dict[str, Task]]] = OrderedDict()
+_DAY_CACHE_MAX = 64
+
+
+def _day_cache_put(path_s: str, mtime_ns: int, tasks: tuple[Task, ...], notes: str) -> None:
+    _DAY_CACHE[path_s] = (mtime_ns, tasks, notes, {t.id: t for t in tasks})
+    _DAY_CACHE.move_to_end(path_s)
+    while len(_DAY_CACHE) > _DAY_CACHE_MAX:
+        _DAY_CACHE.popitem(last=False)
+
+
+def _parse_day_bytes(data: bytes) -> tuple[tuple[Task, ...], str]:
+    raw = orjson.loads(data) if orjson is not None else json.loads(data)
     tasks_raw = raw.get("tasks") or []
     notes = raw.get("notes") or ""
     tasks: list[Task] = []
@@ -127,17 +202,60 @@ def load_day(day: str) -> tuple[list[Task], str]:
                 updated_at=str(t.get("updated_at") or _now_iso()),
             )
         )
-    return tasks, notes
+    return tuple(tasks), notes
+
+
+def _load_day_indexed(day: str) -> tuple[tuple[Task, ...], str, dict[str, Task]]:
+    _ensure_dirs()
+    p = day_json_path(day)
+    if not p.exists():
+        ensure_day(day)
+    path_s = str(p)
+    mtime_ns = p.stat().st_mtime_ns
+    hit = _DAY_CACHE.get(path_s)
+    if hit is not None and hit[0] == mtime_ns:
+        _DAY_CACHE.move_to_end(path_s)
+    else:
+        tasks, notes = _parse_day_bytes(p.read_bytes())
+        _day_cache_put(path_s, mtime_ns, tasks, notes)
+        hit = _DAY_CACHE[path_s]
+    return hit[1], hit[2], hit[3]
+
+
+def load_day(day: str) -> tuple[list[Task], str]:
+    tasks, notes, _by_id = _load_day_indexed(day)
+    # Callers append to the returned list; hand each one its own copy.
+    return list(tasks), notes
 
 
 def save_day(day: str, tasks: list[Task], notes: str) -> None:
     _ensure_dirs()
+    # Inline dict literals: asdict() walks dataclass fields and deepcopies
+    # every value, which adds up on large days.
     payload = {
-        "day": day, 
-        "tasks": [asdict(t) for t in tasks],
+        "day": day,
+        "tasks": [
+            {"id": t.id, "text": t.text, "done": t.done, "created_at": t.created_at, "updated_at": t.updated_at}
+            for t in tasks
+        ],
         "notes": notes
     }
-    day_json_path(day).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    # Write to a sibling temp file and os.replace so a crash mid-write can
+    # never leave a truncated day file behind. Raw os.open/os.write skips the
+    # BufferedWriter layer — the payload is already one bytes object.
+    p = day_json_path(day)
+    tmp = p.with_name(p.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, p)
+    _day_cache_put(str(p), p.stat().st_mtime_ns, tuple(tasks), notes)
 
 
 def ensure_day(day: str) -> tuple[list[Task], str]:
@@ -152,9 +270,10 @@ def ensure_day(day: str) -> tuple[list[Task], str]:
     notes = extract_notes_content(tpl)
     
     now = _now_iso()
+    ids = _new_ids(len(parsed))
     tasks: list[Task] = [
-        Task(id=str(uuid4()), text=text, done=False, created_at=now, updated_at=now)
-        for (_id, text, _done) in parsed
+        Task(id=tid, text=text, done=False, created_at=now, updated_at=now)
+        for tid, (_id, text, _done) in zip(ids, parsed)
     ]
     save_day(day, tasks, notes)
     return tasks, notes
@@ -174,10 +293,11 @@ def apply_markdown_edit(day: str, new_md: str) -> tuple[list[Task], str]:
     now = _now_iso()
     out: list[Task] = []
 
-    # Simple text index for fallback matching (first available).
-    by_text: dict[str, list[Task]] = {}
+    # Simple text index for fallback matching (first available). Deques make
+    # the front-pop O(1); list.pop(0) shifts every remaining element.
+    by_text: dict[str, deque[Task]] = {}
     for t in existing_tasks:
-        by_text.setdefault(t.text.strip(), []).append(t)
+        by_text.setdefault(t.text.strip(), deque()).append(t)
 
     for maybe_id, text, done in parsed:
         text = text.strip()
@@ -188,9 +308,9 @@ def apply_markdown_edit(day: str, new_md: str) -> tuple[list[Task], str]:
         if maybe_id and maybe_id in by_id:
             t = by_id[maybe_id]
         else:
-            candidates = by_text.get(text) or []
+            candidates = by_text.get(text)
             while candidates:
-                cand = candidates.pop(0)
+                cand = candidates.popleft()
                 if cand.id not in used_existing_ids:
                     t = cand
                     break
@@ -214,18 +334,18 @@ def apply_markdown_edit(day: str, new_md: str) -> tuple[list[Task], str]:
 
 
 def set_done(day: str, task_id: str, done: bool) -> tuple[list[Task], str]:
-    tasks, notes = load_day(day)
-    now = _now_iso()
-    found = False
-    out: list[Task] = []
-    for t in tasks:
-        if t.id == task_id:
-            found = True
-            out.append(Task(id=t.id, text=t.text, done=done, created_at=t.created_at, updated_at=now))
-        else:
-            out.append(t)
-    if not found:
+    # The cached by_id index answers "does it exist / is it a no-op" in O(1)
+    # before any list copying happens.
+    tasks, notes, by_id = _load_day_indexed(day)
+    target = by_id.get(task_id)
+    if target is None:
         raise TodoError("Task not found")
+    if target.done == done:
+        # Idempotent toggle: skip the serialize + write cycle.
+        return list(tasks), notes
+    now = _now_iso()
+    updated = Task(id=target.id, text=target.text, done=done, created_at=target.created_at, updated_at=now)
+    out: list[Task] = [updated if t.id == task_id else t for t in tasks]
     save_day(day, out, notes)
     return out, notes
 
@@ -242,9 +362,9 @@ def add_task(day: str, text: str) -> tuple[list[Task], str]:
 
 
 def delete_task(day: str, task_id: str) -> tuple[list[Task], str]:
-    tasks, notes = load_day(day)
-    out = [t for t in tasks if t.id != task_id]
-    if len(out) == len(tasks):
+    tasks, notes, by_id = _load_day_indexed(day)
+    if task_id not in by_id:
         raise TodoError("Task not found")
+    out = [t for t in tasks if t.id != task_id]
     save_day(day, out, notes)
     return out, notes
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import difflib
+import fnmatch
 import hashlib
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Awaitable, Callable
 
 from app.fs.router import fs_list, fs_move, fs_read, fs_write
 from app.agent.tool_errors import ToolStructuredError
 
+try:
+    # Optional linear-time engine: immune to catastrophic backtracking on
+    # pathological queries and considerably faster on big scans.
+    import re2 as _re_engine  # type: ignore[import-not-found]
+except Exception:  # noqa: BLE001
+    _re_engine = re
+
 
 ToolFunc = Callable[[dict[str, Any]], Awaitable[Any]]
 
@@ -21,24 +32,59 @@ DEFAULT_EXCLUDE_GLOBS = [
 ]
 
 
-def _glob_match(path: str, glob: str) -> bool:
-    # Path.match is anchored; strip leading "/" so "**/x" works naturally.
+@lru_cache(maxsize=256)
+def _compile_glob(glob: str) -> re.Pattern[str] | None:
+    # PurePosixPath.match re-parsed the glob for every path tested against
+    # it; translate each glob to a regex once and reuse the compiled pattern.
+    # fnmatch-style translation also makes "**/x/**" exclude the whole
+    # subtree, which is what the default excludes always meant.
     try:
-        from pathlib import PurePosixPath
+        return re.compile(fnmatch.translate(glob))
+    except Exception:  # noqa: BLE001
+        return None
 
-        return PurePosixPath(path.lstrip("/")).match(glob)
-    except Exception:
-        # fallback: very coarse match
-        return False
+
+def _glob_match(path: str, glob: str) -> bool:
+    # Anchored match; strip leading "/" so "**/x" works naturally.
+    rx = _compile_glob(glob)
+    return rx is not None and rx.match(path.lstrip("/")) is not None
+
+
+# The default excludes collapse into one alternation matched with a single
+# regex dispatch instead of five.
+_DEFAULT_EXCLUDE_RE = re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in DEFAULT_EXCLUDE_GLOBS))
 
 
 def _any_glob_match(path: str, globs: list[str]) -> bool:
+    if globs is DEFAULT_EXCLUDE_GLOBS:
+        return _DEFAULT_EXCLUDE_RE.match(path.lstrip("/")) is not None
     for g in globs:
         if g and _glob_match(path, g):
             return True
     return False
 
 
+def _split_excludes(globs: list[str]) -> tuple[frozenset[str], list[str]]:
+    """
+    Split excludes into plain directory names (from "**/name/**" patterns)
+    and everything else. A basename set-membership test skips excluded
+    subtrees without any glob work per entry.
+    """
+    names: set[str] = set()
+    rest: list[str] = []
+    for g in globs:
+        g = str(g)
+        core = g[3:-3]
+        if g.startswith("**/") and g.endswith("/**") and core and "/" not in core and not any(c in core for c in "*?["):
+            names.add(core)
+        else:
+            rest.append(g)
+    return frozenset(names), rest
+
+
+_DEFAULT_EXCLUDE_SPLIT = _split_excludes(DEFAULT_EXCLUDE_GLOBS)
+
+
 @dataclass
 class _GrepStats:
     dirs_visited: int = 0
@@ -88,15 +134,190 @@ def _truncate_utf8(s: str, cap_bytes: int) -> tuple[str, bool, int]:
     b = s.encode("utf-8", errors="replace")
     if len(b) <= cap_bytes:
         return s, False, len(b)
-    cut = b[:cap_bytes]
-    # ensure valid utf-8
-    while True:
-        try:
-            return cut.decode("utf-8", errors="strict"), True, cap_bytes
-        except UnicodeDecodeError:
-            cut = cut[:-1]
-            if not cut:
-                return "", True, 0
+    # Walk the cut point back over UTF-8 continuation bytes (0b10xxxxxx) so
+    # it lands on a character boundary: at most 3 steps and no decode-retry
+    # allocations.
+    end = cap_bytes
+    while end > 0 and (b[end] & 0xC0) == 0x80:
+        end -= 1
+    return b[:end].decode("utf-8"), True, end
+
+
+# How many file reads to issue concurrently per batch in _fs_grep.
+_READ_BATCH_SIZE = 32
+
+# Extensions that are binary by construction: skip before paying for the read.
+_BINARY_EXTS = frozenset(
+    {".png", ".jpg", ".jpeg", ".gif", ".ico", ".pdf", ".zip", ".tar", ".gz", ".wasm", ".so", ".dylib", ".exe"}
+)
+
+
+def _newline_offsets(content: str) -> list[int]:
+    out: list[int] = []
+    idx = content.find("\n")
+    while idx != -1:
+        out.append(idx)
+        idx = content.find("\n", idx + 1)
+    return out
+
+
+def _total_lines(content: str, nls: list[int]) -> int:
+    # Matches splitlines(): a trailing newline does not start a final empty line.
+    return len(nls) if content.endswith("\n") else len(nls) + 1
+
+
+def _line_slice(content: str, nls: list[int], j: int) -> str:
+    start = nls[j - 1] + 1 if j else 0
+    end = nls[j] if j < len(nls) else len(content)
+    return content[start:end]
+
+
+def _context_slices(content: str, nls: list[int], lo: int, hi: int) -> list[str]:
+    return [_line_slice(content, nls, j) for j in range(lo, hi)]
+
+
+def _scan_file(
+    p: str,
+    content: str,
+    *,
+    rx: re.Pattern[str] | None,
+    query: str,
+    case_sensitive: bool,
+    context_before: int,
+    context_after: int,
+    stats: _GrepStats,
+    max_matches: int,
+    matches_out: list[dict[str, Any]],
+) -> bool:
+    """Scan one file's content; returns True when max_matches was reached."""
+    if not content:
+        return False
+
+    if rx is not None:
+        # One finditer over the whole buffer (the pattern is compiled with
+        # MULTILINE so ^/$ still anchor per line); line/col come from the
+        # same lazy newline-offset table as the literal path. A match that
+        # spans a newline (possible when the pattern has \s, \n, ...) has no
+        # per-line equivalent, so the first one triggers a rescan of this
+        # file the old line-by-line way. Up to that point the two scans emit
+        # identical matches, so the common no-span case pays nothing.
+        base_len = len(matches_out)
+        base_matches = stats.matches
+        spanning = False
+        rnls: list[int] | None = None
+        rtotal = 0
+        for m in rx.finditer(content):
+            if "\n" in m.group(0):
+                spanning = True
+                break
+            if rnls is None:
+                rnls = _newline_offsets(content)
+                rtotal = _total_lines(content, rnls)
+            idx = m.start()
+            if idx < len(content) and content[idx] == "\n":
+                # Zero-width match sitting on a line terminator: per-line
+                # scanning reported it at the end of the preceding line.
+                i = bisect_right(rnls, idx) - 1
+            else:
+                i = bisect_right(rnls, idx)
+                if i >= rtotal:
+                    # Zero-width match after a trailing newline; splitlines
+                    # has no such phantom empty line.
+                    continue
+            line_start = rnls[i - 1] + 1 if i else 0
+            stats.matches += 1
+            matches_out.append(
+                {
+                    "path": p,
+                    "line": i + 1,
+                    "col": idx - line_start + 1,
+                    "line_text": _line_slice(content, rnls, i),
+                    "before": _context_slices(content, rnls, max(0, i - context_before), i),
+                    "after": _context_slices(content, rnls, i + 1, min(rtotal, i + 1 + context_after)),
+                }
+            )
+            if stats.matches >= max_matches:
+                return True
+        if spanning:
+            del matches_out[base_len:]
+            stats.matches = base_matches
+            lines = content.splitlines()
+            for i, line in enumerate(lines):
+                for m in rx.finditer(line):
+                    stats.matches += 1
+                    matches_out.append(
+                        {
+                            "path": p,
+                            "line": i + 1,
+                            "col": m.start() + 1,
+                            "line_text": line,
+                            "before": lines[max(0, i - context_before) : i],
+                            "after": lines[i + 1 : i + 1 + context_after],
+                        }
+                    )
+                    if stats.matches >= max_matches:
+                        return True
+    else:
+        q = query if case_sensitive else query.lower()
+        hay = content if case_sensitive else content.lower()
+        if len(hay) == len(content) and "\n" not in q:
+            # One C-level find over the whole buffer per hit instead of a
+            # Python loop over every line; line/col come from a lazily built
+            # newline-offset table. (Most files have no hits, so they cost a
+            # single find and never build the table or split into lines.)
+            nls: list[int] | None = None
+            total = 0
+            step = max(1, len(q))
+            start = 0
+            while True:
+                idx = hay.find(q, start)
+                if idx == -1:
+                    break
+                if nls is None:
+                    nls = _newline_offsets(content)
+                    total = _total_lines(content, nls)
+                i = bisect_right(nls, idx)
+                line_start = nls[i - 1] + 1 if i else 0
+                stats.matches += 1
+                matches_out.append(
+                    {
+                        "path": p,
+                        "line": i + 1,
+                        "col": idx - line_start + 1,
+                        "line_text": _line_slice(content, nls, i),
+                        "before": _context_slices(content, nls, max(0, i - context_before), i),
+                        "after": _context_slices(content, nls, i + 1, min(total, i + 1 + context_after)),
+                    }
+                )
+                if stats.matches >= max_matches:
+                    return True
+                start = idx + step
+        else:
+            # Rare: lowercasing changed the string length (e.g. 'İ'), so
+            # offsets wouldn't line up; keep the per-line scan for these.
+            lines = content.splitlines()
+            for i, line in enumerate(lines):
+                lhay = line if case_sensitive else line.lower()
+                start = 0
+                while True:
+                    idx = lhay.find(q, start)
+                    if idx == -1:
+                        break
+                    stats.matches += 1
+                    matches_out.append(
+                        {
+                            "path": p,
+                            "line": i + 1,
+                            "col": idx + 1,
+                            "line_text": line,
+                            "before": lines[max(0, i - context_before) : i],
+                            "after": lines[i + 1 : i + 1 + context_after],
+                        }
+                    )
+                    if stats.matches >= max_matches:
+                        return True
+                    start = idx + max(1, len(q))
+    return False
 
 
 async def _fs_grep(args: dict[str, Any]) -> Any:
@@ -135,12 +356,25 @@ async def _fs_grep(args: dict[str, Any]) -> Any:
         exclude_globs = DEFAULT_EXCLUDE_GLOBS
     if not isinstance(exclude_globs, list):
         exclude_globs = DEFAULT_EXCLUDE_GLOBS
-
-    flags = 0 if case_sensitive else re.IGNORECASE
+    if exclude_globs is DEFAULT_EXCLUDE_GLOBS:
+        exclude_dir_names, exclude_rest = _DEFAULT_EXCLUDE_SPLIT
+    else:
+        exclude_dir_names, exclude_rest = _split_excludes(exclude_globs)
+
+    # MULTILINE keeps ^/$ anchored per line now that the scan runs over the
+    # whole file buffer.
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
     rx = None
     if regex:
         try:
-            rx = re.compile(query, flags=flags)
+            # re2 rejects some constructs (backreferences, lookaround);
+            # fall back to stdlib re for those queries.
+            try:
+                rx = _re_engine.compile(query, flags)
+            except Exception:  # noqa: BLE001
+                if _re_engine is re:
+                    raise
+                rx = re.compile(query, flags=flags)
         except Exception as e:  # noqa: BLE001
             raise ToolStructuredError(
                 {
@@ -149,6 +383,15 @@ async def _fs_grep(args: dict[str, Any]) -> Any:
                     "stats": _GrepStats().as_dict(),
                 }
             ) from e
+    elif not case_sensitive:
+        # Case-insensitive literal: one escaped pattern compiled here and
+        # shared across every file. The engine's IGNORECASE matching with a
+        # fixed-string needle beats allocating content.lower() per file,
+        # which doubled memory traffic on big scans.
+        try:
+            rx = _re_engine.compile(re.escape(query), flags)
+        except Exception:  # noqa: BLE001
+            rx = re.compile(re.escape(query), flags=flags)
 
     stats = _GrepStats()
     matches_out: list[dict[str, Any]] = []
@@ -202,104 +445,101 @@ async def _fs_grep(args: dict[str, Any]) -> Any:
             stats.skipped_read_error += 1
             continue
 
+        # Collect this directory's matching files first, then read them in
+        # concurrent batches: the reads are I/O-bound, so overlapping them in
+        # worker threads keeps the CPU busy instead of waiting per file.
+        pending_files: list[str] = []
         for ent in entries:
-            if stats.files_read >= max_files:
-                truncated = True
-                stop_reason = "max_files"
-                break
-            if stats.matches >= max_matches:
-                truncated = True
-                stop_reason = "max_matches"
-                break
             if not isinstance(ent, dict):
                 continue
             p = str(ent.get("path") or "")
             kind = str(ent.get("kind") or "")
             if not p:
                 continue
-            if _any_glob_match(p, exclude_globs):
-                continue
             if kind == "dir":
+                # Basename check first: skipping a node_modules/.git subtree
+                # here costs a set lookup instead of N glob matches.
+                if p.rsplit("/", 1)[-1] in exclude_dir_names:
+                    continue
+                if exclude_rest and _any_glob_match(p, exclude_rest):
+                    continue
                 to_visit.append(p)
                 continue
             if kind != "file":
                 continue
+            if exclude_rest and _any_glob_match(p, exclude_rest):
+                continue
 
             stats.files_considered += 1
             if include_globs and not _any_glob_match(p, include_globs):
                 continue
+            dot = p.rfind(".")
+            if dot != -1 and p[dot:].lower() in _BINARY_EXTS:
+                stats.skipped_binary_or_decode_failed += 1
+                continue
+            pending_files.append(p)
 
-            try:
-                r = fs_read(p, max_bytes=max_file_bytes)
-                content = r.get("content")
+        batch_start = 0
+        while batch_start < len(pending_files) and not truncated:
+            budget = max_files - stats.files_read
+            if budget <= 0:
+                truncated = True
+                stop_reason = "max_files"
+                break
+            if stats.matches >= max_matches:
+                truncated = True
+                stop_reason = "max_matches"
+                break
+            chunk = pending_files[batch_start : batch_start + min(_READ_BATCH_SIZE, budget)]
+            batch_start += len(chunk)
+            results = await asyncio.gather(
+                *(asyncio.to_thread(fs_read, fp, max_bytes=max_file_bytes) for fp in chunk),
+                return_exceptions=True,
+            )
+            for p, res in zip(chunk, results):
+                if stats.matches >= max_matches:
+                    truncated = True
+                    stop_reason = "max_matches"
+                    break
+                if isinstance(res, BaseException):
+                    msg = str(res)
+                    if "too large" in msg.lower():
+                        stats.skipped_too_large += 1
+                    elif isinstance(res, UnicodeDecodeError) or "decode" in msg.lower():
+                        stats.skipped_binary_or_decode_failed += 1
+                    else:
+                        stats.skipped_read_error += 1
+                    continue
+                content = res.get("content") if isinstance(res, dict) else None
                 if not isinstance(content, str):
                     stats.skipped_binary_or_decode_failed += 1
                     continue
-                if len(content.encode("utf-8", errors="replace")) > max_file_bytes:
-                    stats.skipped_too_large += 1
+                # grep -I heuristic: binary formats that happen to decode
+                # almost always carry a NUL early; one memchr over the first
+                # 8 KB rules them out before any match work.
+                if content.find("\x00", 0, 8192) != -1:
+                    stats.skipped_binary_or_decode_failed += 1
                     continue
+                # fs_read already enforces max_bytes (oversized files raise),
+                # so no re-encode-to-measure pass is needed here.
                 stats.files_read += 1
-            except Exception as e:  # noqa: BLE001
-                msg = str(e)
-                if "too large" in msg.lower():
-                    stats.skipped_too_large += 1
-                elif isinstance(e, UnicodeDecodeError) or "decode" in msg.lower():
-                    stats.skipped_binary_or_decode_failed += 1
-                else:
-                    stats.skipped_read_error += 1
-                continue
-
-            lines = content.splitlines()
-            if not lines:
-                continue
 
-            if regex and rx is not None:
-                for i, line in enumerate(lines):
-                    for m in rx.finditer(line):
-                        stats.matches += 1
-                        matches_out.append(
-                            {
-                                "path": p,
-                                "line": i + 1,
-                                "col": m.start() + 1,
-                                "line_text": line,
-                                "before": lines[max(0, i - context_before) : i],
-                                "after": lines[i + 1 : i + 1 + context_after],
-                            }
-                        )
-                        if stats.matches >= max_matches:
-                            truncated = True
-                            stop_reason = "max_matches"
-                            break
-                    if truncated and stop_reason == "max_matches":
-                        break
-            else:
-                q = query if case_sensitive else query.lower()
-                for i, line in enumerate(lines):
-                    hay = line if case_sensitive else line.lower()
-                    start = 0
-                    while True:
-                        idx = hay.find(q, start)
-                        if idx == -1:
-                            break
-                        stats.matches += 1
-                        matches_out.append(
-                            {
-                                "path": p,
-                                "line": i + 1,
-                                "col": idx + 1,
-                                "line_text": line,
-                                "before": lines[max(0, i - context_before) : i],
-                                "after": lines[i + 1 : i + 1 + context_after],
-                            }
-                        )
-                        if stats.matches >= max_matches:
-                            truncated = True
-                            stop_reason = "max_matches"
-                            break
-                        start = idx + max(1, len(q))
-                    if truncated and stop_reason == "max_matches":
-                        break
+                self_matches = _scan_file(
+                    p,
+                    content,
+                    rx=rx,
+                    query=query,
+                    case_sensitive=case_sensitive,
+                    context_before=context_before,
+                    context_after=context_after,
+                    stats=stats,
+                    max_matches=max_matches,
+                    matches_out=matches_out,
+                )
+                if self_matches:
+                    truncated = True
+                    stop_reason = "max_matches"
+                    break
 
         if truncated:
             break
@@ -317,24 +557,17 @@ async def _fs_grep(args: dict[str, Any]) -> Any:
     }
 
 
-def _count_non_overlapping(hay: str, needle: str) -> list[int]:
-    if not needle:
-        return []
-    out: list[int] = []
-    i = 0
-    while True:
-        idx = hay.find(needle, i)
-        if idx == -1:
-            break
-        out.append(idx)
-        i = idx + len(needle)
-    return out
-
-
 def _sha256_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8", errors="replace")).hexdigest()
 
 
+def _utf8_len(s: str) -> int:
+    # Pure-ASCII strings (the common case for code) measure for free.
+    if s.isascii():
+        return len(s)
+    return len(s.encode("utf-8", errors="replace"))
+
+
 async def _fs_patch(args: dict[str, Any]) -> Any:
     path = str(args.get("path") or "").strip()
     edits = args.get("edits") or []
@@ -361,13 +594,23 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             {"ok": False, "path": path, "error": {"code": "read_failed", "message": str(e), "details": {"path": path}}}
         ) from e
 
-    before_bytes = len(before.encode("utf-8", errors="replace"))
+    # Hashing 512 KB twice per call adds up; compute the before-hash at most
+    # once, and only on paths that actually report it.
+    _before_sha: str | None = None
+
+    def before_sha() -> str:
+        nonlocal _before_sha
+        if _before_sha is None:
+            _before_sha = _sha256_text(before)
+        return _before_sha
+
+    before_bytes = _utf8_len(before)
     if before_bytes > max_file_bytes:
         raise ToolStructuredError(
             {
                 "ok": False,
                 "path": path,
-                "before_sha256": _sha256_text(before),
+                "before_sha256": before_sha(),
                 "error": {
                     "code": "too_large",
                     "message": f"file exceeds max_file_bytes ({before_bytes} > {max_file_bytes})",
@@ -384,7 +627,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
         payload = {
             "ok": False,
             "path": path,
-            "before_sha256": _sha256_text(before),
+            "before_sha256": before_sha(),
             "error": {"code": code, "message": message, "details": details},
             "edit_results": edit_results,
             "diff_unified": "",
@@ -416,8 +659,10 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             if not old:
                 edit_results.append({**base_res, "matches_found": 0, "status": "failed"})
                 raise fail(code="invalid_edit", message="replace.old must be non-empty", details={"edit_index": idx, "op": op})
-            hits = _count_non_overlapping(cur, old)
-            found = len(hits)
+            # str.count walks the haystack left-to-right without overlap —
+            # the same semantics the old offset-collecting loop had, minus
+            # the Python-level loop and the offsets list nobody read.
+            found = cur.count(old)
             if found != expected:
                 edit_results.append({**base_res, "matches_found": found, "status": "failed"})
                 samples = _find_line_col_samples(cur, old, max_samples=3)
@@ -429,8 +674,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             if found == 0:
                 edit_results.append({**base_res, "matches_found": 0, "status": "ok"})
                 continue
-            total_delta += len(old.encode("utf-8", errors="replace")) * found
-            total_delta += len(new.encode("utf-8", errors="replace")) * found
+            total_delta += (_utf8_len(old) + _utf8_len(new)) * found
             if total_delta > max_total_delta_bytes:
                 edit_results.append({**base_res, "matches_found": found, "status": "failed"})
                 raise fail(
@@ -438,15 +682,10 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
                     message=f"total edit delta exceeds cap ({total_delta} > {max_total_delta_bytes})",
                     details={"total_delta_bytes": total_delta, "max_total_delta_bytes": max_total_delta_bytes},
                 )
-            # Apply replacements from end to start for stable slicing.
-            pieces: list[str] = []
-            last = 0
-            for pos in hits:
-                pieces.append(cur[last:pos])
-                pieces.append(new)
-                last = pos + len(old)
-            pieces.append(cur[last:])
-            cur = "".join(pieces)
+            # The count above validated with the same left-to-right
+            # non-overlapping walk str.replace does, so one C-level pass is
+            # equivalent to the old piece-list splicing.
+            cur = cur.replace(old, new)
             edit_results.append({**base_res, "matches_found": found, "status": "ok"})
 
         elif op == "delete":
@@ -454,8 +693,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             if not old:
                 edit_results.append({**base_res, "matches_found": 0, "status": "failed"})
                 raise fail(code="invalid_edit", message="delete.old must be non-empty", details={"edit_index": idx, "op": op})
-            hits = _count_non_overlapping(cur, old)
-            found = len(hits)
+            found = cur.count(old)
             if found != expected:
                 edit_results.append({**base_res, "matches_found": found, "status": "failed"})
                 samples = _find_line_col_samples(cur, old, max_samples=3)
@@ -467,7 +705,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             if found == 0:
                 edit_results.append({**base_res, "matches_found": 0, "status": "ok"})
                 continue
-            total_delta += len(old.encode("utf-8", errors="replace")) * found
+            total_delta += _utf8_len(old) * found
             if total_delta > max_total_delta_bytes:
                 edit_results.append({**base_res, "matches_found": found, "status": "failed"})
                 raise fail(
@@ -484,8 +722,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             if not anchor:
                 edit_results.append({**base_res, "matches_found": 0, "status": "failed"})
                 raise fail(code="invalid_edit", message="insert.anchor must be non-empty", details={"edit_index": idx, "op": op})
-            hits = _count_non_overlapping(cur, anchor)
-            found = len(hits)
+            found = cur.count(anchor)
             if found != expected:
                 edit_results.append({**base_res, "matches_found": found, "status": "failed"})
                 samples = _find_line_col_samples(cur, anchor, max_samples=3)
@@ -497,7 +734,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             if found == 0:
                 edit_results.append({**base_res, "matches_found": 0, "status": "ok"})
                 continue
-            total_delta += len(insert.encode("utf-8", errors="replace")) * found
+            total_delta += _utf8_len(insert) * found
             if total_delta > max_total_delta_bytes:
                 edit_results.append({**base_res, "matches_found": found, "status": "failed"})
                 raise fail(
@@ -505,12 +742,12 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
                     message=f"total edit delta exceeds cap ({total_delta} > {max_total_delta_bytes})",
                     details={"total_delta_bytes": total_delta, "max_total_delta_bytes": max_total_delta_bytes},
                 )
-            # Apply from end to start.
-            for pos in reversed(hits):
-                if op == "insert_before":
-                    cur = cur[:pos] + insert + cur[pos:]
-                else:
-                    cur = cur[: pos + len(anchor)] + insert + cur[pos + len(anchor) :]
+            # One C-level pass; replace() never rescans the text it just
+            # wrote, so anchors inside `insert` don't multiply.
+            if op == "insert_before":
+                cur = cur.replace(anchor, insert + anchor)
+            else:
+                cur = cur.replace(anchor, anchor + insert)
             edit_results.append({**base_res, "matches_found": found, "status": "ok"})
 
         else:
@@ -518,13 +755,13 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             raise fail(code="invalid_edit", message=f"unknown op: {op}", details={"edit_index": idx, "op": op})
 
     after = cur
-    after_bytes = len(after.encode("utf-8", errors="replace"))
+    after_bytes = _utf8_len(after)
     if after_bytes > max_file_bytes:
         raise ToolStructuredError(
             {
                 "ok": False,
                 "path": path,
-                "before_sha256": _sha256_text(before),
+                "before_sha256": before_sha(),
                 "error": {
                     "code": "too_large",
                     "message": f"result exceeds max_file_bytes ({after_bytes} > {max_file_bytes})",
@@ -538,16 +775,26 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
             }
         )
 
-    diff = "\n".join(
-        difflib.unified_diff(
-            before.splitlines(),
-            after.splitlines(),
-            fromfile=f"a{path}",
-            tofile=f"b{path}",
-            lineterm="",
-        )
-    )
-    diff, diff_truncated, diff_bytes = _truncate_utf8(diff, diff_cap_bytes)
+    # unified_diff is lazy; consume it with an inline byte budget so a capped
+    # diff stops generating (and encoding) as soon as the cap is hit instead
+    # of building the full text and truncating afterwards.
+    diff_parts: list[str] = []
+    diff_bytes = 0
+    diff_truncated = False
+    for ln in difflib.unified_diff(
+        before.splitlines(),
+        after.splitlines(),
+        fromfile=f"a{path}",
+        tofile=f"b{path}",
+        lineterm="",
+    ):
+        ln_bytes = _utf8_len(ln) + (1 if diff_parts else 0)
+        if diff_bytes + ln_bytes > diff_cap_bytes:
+            diff_truncated = True
+            break
+        diff_parts.append(ln)
+        diff_bytes += ln_bytes
+    diff = "\n".join(diff_parts)
 
     if before != after:
         try:
@@ -557,7 +804,7 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
                 {
                     "ok": False,
                     "path": path,
-                    "before_sha256": _sha256_text(before),
+                    "before_sha256": before_sha(),
                     "error": {"code": "write_failed", "message": str(e), "details": {"path": path}},
                     "edit_results": edit_results,
                     "diff_unified": diff,
@@ -571,8 +818,8 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
         "ok": True,
         "path": path,
         "changed": before != after,
-        "before_sha256": _sha256_text(before),
-        "after_sha256": _sha256_text(after),
+        "before_sha256": before_sha(),
+        "after_sha256": before_sha() if before == after else _sha256_text(after),
         "diagnostics": {"before_bytes": before_bytes, "after_bytes": after_bytes, "total_delta_bytes": total_delta},
         "edit_results": edit_results,
         "diff_unified": diff,
@@ -581,8 +828,11 @@ async def _fs_patch(args: dict[str, Any]) -> Any:
         "diff_cap_bytes": diff_cap_bytes,
     }
 
+# The underlying fs_* calls are synchronous disk I/O; run them in worker
+# threads so one slow read/write doesn't stall every other tool call on the
+# event loop.
 async def _fs_list(args: dict[str, Any]) -> Any:
-    return fs_list(str(args.get("path", "")))
+    return await asyncio.to_thread(fs_list, str(args.get("path", "")))
 
 
 async def _fs_read(args: dict[str, Any]) -> Any:
@@ -590,31 +840,34 @@ async def _fs_read(args: dict[str, Any]) -> Any:
     path_arg = args.get("path")
     if not path_arg:
         raise ValueError("Missing path argument")
-    return fs_read(path_arg, max_bytes=int(args.get("max_bytes", 512_000)))
+    return await asyncio.to_thread(fs_read, path_arg, max_bytes=int(args.get("max_bytes", 512_000)))
 
 
 async def _fs_write(args: dict[str, Any]) -> Any:
-    return fs_write(str(args.get("path", "")), content=str(args.get("content", "")))
+    return await asyncio.to_thread(fs_write, str(args.get("path", "")), content=str(args.get("content", "")))
+
 
 async def _fs_move(args: dict[str, Any]) -> Any:
     # 'fromPath' and 'toPath' can be str or list[str]
     from_arg = args.get("fromPath") or args.get("from_path")
     to_arg = args.get("toPath") or args.get("to_path")
     if not from_arg or not to_arg:
-         raise ValueError("Missing fromPath or toPath argument")
-    if not from_arg or not to_arg:
-         raise ValueError("Missing fromPath or toPath argument")
-    return fs_move(from_arg, to_arg)
+        raise ValueError("Missing fromPath or toPath argument")
+    return await asyncio.to_thread(fs_move, from_arg, to_arg)
+
+
+# The handler map is static; build it once instead of per dispatch call.
+_TOOL_HANDLERS: dict[str, ToolFunc] = {
+    "fs_list": _fs_list,
+    "fs_read": _fs_read,
+    "fs_write": _fs_write,
+    "fs_move": _fs_move,
+    "fs_grep": _fs_grep,
+    "fs_patch": _fs_patch,
+}
 
 
 def tool_handlers() -> dict[str, ToolFunc]:
-    return {
-        "fs_list": _fs_list,
-        "fs_read": _fs_read,
-        "fs_write": _fs_write,
-        "fs_move": _fs_move,
-        "fs_grep": _fs_grep,
-        "fs_patch": _fs_patch,
-    }
+    return _TOOL_HANDLERS
 
 
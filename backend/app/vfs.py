@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+from collections import OrderedDict
 
 from app.todos.store import (
     TodoError,
     apply_markdown_edit,
     data_dir,
+    day_json_path,
     ensure_day,
     render_markdown,
     template_path,
@@ -18,6 +24,9 @@ class VfsError(RuntimeError):
     pass
 
 
+# Clients hit the same handful of paths over and over (today, template,
+# recent days); memoizing skips the branch work on repeats.
+@lru_cache(maxsize=1024)
 def _normalize(path: str) -> str:
     if not path.startswith("/"):
         path = "/" + path
@@ -27,17 +36,38 @@ def _normalize(path: str) -> str:
     return path
 
 
+# (dir path, dir mtime_ns, sorted days). Creating, deleting, or renaming a
+# day file bumps the directory mtime, so a single stat decides whether the
+# cached listing is still good — the UI polls /fs/todos far more often than
+# the archive changes. Tuple assignment is atomic under the GIL; no lock.
+_DAYS_CACHE: tuple[str, int, list[str]] | None = None
+
+
 def _list_todo_files() -> list[str]:
-    root = data_dir()
-    if not root.exists():
+    global _DAYS_CACHE
+    root = str(data_dir())
+    try:
+        mtime_ns = os.stat(root).st_mtime_ns
+    except FileNotFoundError:
         return []
+    cached = _DAYS_CACHE
+    if cached is not None and cached[0] == root and cached[1] == mtime_ns:
+        return cached[2]
+    # os.scandir reads the directory in one getdents pass: no fnmatch per
+    # entry and no Path object per file.
     days: list[str] = []
-    for p in root.glob("*.json"):
-        day = p.stem
-        # naive validation: YYYY-MM-DD length
-        if len(day) == 10 and day[4] == "-" and day[7] == "-":
-            days.append(day)
-    return sorted(days, reverse=True)
+    try:
+        with os.scandir(root) as it:
+            for e in it:
+                name = e.name
+                # naive validation: YYYY-MM-DD.json length
+                if len(name) == 15 and name.endswith(".json") and name[4] == "-" and name[7] == "-":
+                    days.append(name[:-5])
+    except FileNotFoundError:
+        return []
+    days.sort(reverse=True)
+    _DAYS_CACHE = (root, mtime_ns, days)
+    return days
 
 
 def vfs_list(path: str) -> dict[str, Any]:
@@ -55,46 +85,107 @@ def vfs_list(path: str) -> dict[str, Any]:
     raise VfsError("Unknown virtual directory")
 
 
-def _day_from_todo_md_path(path: str) -> str:
+_DAY_RE = re.compile(r"^/fs/todos/(\d{4}-\d{2}-\d{2})\.todo\.md$")
+
+
+def _day_from_todo_md_path(path: str) -> Optional[str]:
+    # One anchored match classifies the path and extracts the day together,
+    # replacing the startswith/endswith pre-check plus manual slicing.
     if path == "/fs/todos/today.todo.md":
         return today_str()
+    m = _DAY_RE.match(path)
+    return m.group(1) if m else None
+
+
+def _unsupported(path: str) -> VfsError:
     if path.startswith("/fs/todos/") and path.endswith(".todo.md"):
-        name = path.split("/")[-1]
-        day = name[:-8]  # remove .todo.md
-        if len(day) == 10 and day[4] == "-" and day[7] == "-":
-            return day
-    raise VfsError("Unsupported todo file path")
+        return VfsError("Unsupported todo file path")
+    return VfsError("Unknown virtual file")
+
+
+# day -> (mtime_ns, rendered markdown), LRU-bounded like the store's day
+# cache. A save rewrites the day file and bumps its mtime, so stale entries
+# miss naturally.
+_RENDER_CACHE: OrderedDict[str, tuple[int, str]] = OrderedDict()
+_RENDER_CACHE_MAX = 64
+
+
+# (mtime_ns, size, decoded content) for the template file. The template
+# rarely changes, so after the first read the hot path is one stat; an edit
+# through vfs_write (or anything else) bumps the mtime and misses naturally.
+_TPL_CACHE: tuple[int, int, str] | None = None
 
 
 def vfs_read(path: str) -> dict[str, Any]:
+    global _TPL_CACHE
     path = _normalize(path)
     if path == "/fs/todos/template.todo.md":
-        # allow reading template directly from disk
-        if not template_path().exists():
+        # allow reading template directly from disk; the stat doubles as the
+        # old exists() check.
+        tp = template_path()
+        try:
+            st = os.stat(tp)
+        except FileNotFoundError:
             ensure_day(today_str())
-        return {"path": path, "content": template_path().read_text(encoding="utf-8")}
-
-    if path.startswith("/fs/todos/") and path.endswith(".todo.md"):
-        day = _day_from_todo_md_path(path)
+            st = os.stat(tp)
+        cached = _TPL_CACHE
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            content = cached[2]
+        else:
+            content = tp.read_text(encoding="utf-8")
+            _TPL_CACHE = (st.st_mtime_ns, st.st_size, content)
+        return {"path": path, "content": content}
+
+    day = _day_from_todo_md_path(path)
+    if day is not None:
         tasks, notes = ensure_day(day)
-        return {"path": path, "content": render_markdown(day, tasks, notes)}
-
-    raise VfsError("Unknown virtual file")
+        # Rendered markdown keyed by the day file's mtime, same shape as the
+        # store's day cache: archive days are immutable in practice, and even
+        # today only re-renders after a real write.
+        mtime_ns = day_json_path(day).stat().st_mtime_ns
+        hit = _RENDER_CACHE.get(day)
+        if hit is not None and hit[0] == mtime_ns:
+            _RENDER_CACHE.move_to_end(day)
+            content = hit[1]
+        else:
+            content = render_markdown(day, tasks, notes)
+            _RENDER_CACHE[day] = (mtime_ns, content)
+            _RENDER_CACHE.move_to_end(day)
+            while len(_RENDER_CACHE) > _RENDER_CACHE_MAX:
+                _RENDER_CACHE.popitem(last=False)
+        return {"path": path, "content": content}
+
+    raise _unsupported(path)
 
 
 def vfs_write(path: str, *, content: str) -> dict[str, Any]:
     path = _normalize(path)
     if path == "/fs/todos/template.todo.md":
-        template_path().parent.mkdir(parents=True, exist_ok=True)
-        template_path().write_text(content, encoding="utf-8")
+        tp = template_path()
+        # Autosaving UIs re-send identical content; skip the mkdir+write
+        # pair when the file already matches byte for byte.
+        try:
+            unchanged = tp.read_bytes() == content.encode("utf-8")
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            return {"path": path, "ok": True, "unchanged": True}
+        tp.parent.mkdir(parents=True, exist_ok=True)
+        tp.write_text(content, encoding="utf-8")
         return {"path": path, "ok": True}
 
-    if path.startswith("/fs/todos/") and path.endswith(".todo.md"):
-        day = _day_from_todo_md_path(path)
+    day = _day_from_todo_md_path(path)
+    if day is not None:
         try:
+            # A write that round-trips to the exact current markdown would
+            # only bump every task's updated_at and fsync the same state
+            # back; elide it.
+            tasks, notes = ensure_day(day)
+            if content == render_markdown(day, tasks, notes):
+                return {"path": path, "ok": True, "task_count": len(tasks), "unchanged": True}
             tasks, _notes = apply_markdown_edit(day, content)
         except TodoError as e:
             raise VfsError(str(e)) from e
         return {"path": path, "ok": True, "task_count": len(tasks)}
 
-    raise VfsError("Unknown virtual file")
+    raise _unsupported(path)
@@ -1,34 +1,73 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
-from typing import Any, DefaultDict
+from typing import Any
 
 from fastapi import WebSocket
 
+from app._json import dumps as json_dumps
 
-_lock = asyncio.Lock()
-_conns: DefaultDict[str, set[WebSocket]] = defaultdict(set)
+
+# No lock: every mutation below is a synchronous section with no await
+# inside, and the hub only runs on the event-loop thread, so nothing can
+# interleave mid-update. The old global asyncio.Lock just serialized
+# unrelated sessions behind each other for no protection gained.
+# Sockets are keyed by id(ws): O(1) removal without hashing the WebSocket
+# object, and fan-out follows stable insertion order. Plain dict, not
+# defaultdict: unregister already prunes empty sessions, and a defaultdict
+# would quietly resurrect a key on any stray read.
+_conns: dict[str, dict[int, WebSocket]] = {}
+
+# Cap on how long one client's saturated send buffer can hold up a
+# broadcast; a socket that can't take a frame within this window is dropped
+# like one that raised.
+_SEND_TIMEOUT = 2.0
+
+
+def _prune(session_id: str, ws: WebSocket) -> None:
+    conns = _conns.get(session_id)
+    if conns is not None:
+        conns.pop(id(ws), None)
+        if not conns:
+            # Don't let dead session keys accumulate in _conns.
+            del _conns[session_id]
 
 
 async def register(session_id: str, ws: WebSocket) -> None:
-    async with _lock:
-        _conns[session_id].add(ws)
+    _conns.setdefault(session_id, {})[id(ws)] = ws
 
 
 async def unregister(session_id: str, ws: WebSocket) -> None:
-    async with _lock:
-        _conns[session_id].discard(ws)
+    _prune(session_id, ws)
 
 
 async def send(session_id: str, msg: dict[str, Any]) -> None:
-    async with _lock:
-        targets = list(_conns.get(session_id, set()))
-    for ws in targets:
+    conns = _conns.get(session_id)
+    if not conns:
+        return
+    targets = list(conns.values())
+    # Encode once for the whole fan-out: send_json would re-serialize the
+    # same dict per subscriber. Clients still receive a text JSON frame.
+    payload = json_dumps(msg)
+    if len(targets) == 1:
+        # Common case: one tab per session; skip the gather machinery.
         try:
-            await ws.send_json(msg)
+            await asyncio.wait_for(targets[0].send_text(payload), _SEND_TIMEOUT)
         except Exception:
-            # Best-effort; caller can prune on disconnect path.
-            pass
+            # Drop the dead socket now rather than failing into it on every
+            # broadcast until its disconnect handler runs.
+            _prune(session_id, targets[0])
+        return
+    # Concurrent fan-out: a slow or backpressured client no longer serializes
+    # delivery to everyone behind it. return_exceptions keeps the broadcast
+    # best-effort, matching the old per-send swallow (a TaskGroup would
+    # cancel the healthy sends when one raises).
+    results = await asyncio.gather(
+        *(asyncio.wait_for(ws.send_text(payload), _SEND_TIMEOUT) for ws in targets),
+        return_exceptions=True,
+    )
+    for ws, res in zip(targets, results):
+        if isinstance(res, BaseException):
+            _prune(session_id, ws)
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
 
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -29,8 +30,11 @@ def main() -> int:
     cred_path = Path(args.credentials).expanduser().resolve()
     token_path = Path(args.token).expanduser().resolve()
 
-    if not cred_path.exists():
-        raise SystemExit(f"credentials file not found: {cred_path}")
+    # One stat instead of an exists() probe followed by the library's open.
+    try:
+        os.stat(cred_path)
+    except FileNotFoundError:
+        raise SystemExit(f"credentials file not found: {cred_path}") from None
 
     flow = InstalledAppFlow.from_client_secrets_file(str(cred_path), scopes=SCOPES)
     
@@ -64,8 +68,9 @@ def main() -> int:
         # Local server flow: automatic redirect
         creds = flow.run_local_server(port=int(args.port))
 
-    token_path.parent.mkdir(parents=True, exist_ok=True)
-    token_path.write_text(creds.to_json(), encoding="utf-8")
+    os.makedirs(token_path.parent, exist_ok=True)
+    with open(token_path, "w", encoding="utf-8") as f:
+        f.write(creds.to_json())
     print(f"Wrote token: {token_path}")
     return 0
 